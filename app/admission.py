@@ -0,0 +1,179 @@
+import math
+import time
+from collections import OrderedDict
+from typing import Hashable, Iterable, Optional
+
+from starlette.responses import HTMLResponse, JSONResponse, Response
+
+from app.config import settings
+from app.metrics import Gauge, admission_rejections, registry
+from app.rendering import render_html
+
+GLOBAL = "*"
+
+
+class Overloaded(Exception):
+    """Expensive work refused because it could not start within the latency budget."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Overloaded, retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class RateLimiter:
+    """Token buckets per key, refilled at ``rate`` tokens per second up to ``burst``.
+
+    Buckets are kept in an LRU of at most ``max_keys``. The one evicted has
+    been idle longest, so it has usually refilled already and forgetting it
+    loses nothing. ``rate <= 0`` disables the limit.
+    """
+
+    def __init__(self, rate: float, burst: int, max_keys: int = 1):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.max_keys = max(max_keys, 1)
+        # key -> [tokens, last refill time]
+        self._buckets: "OrderedDict[Hashable, list]" = OrderedDict()
+        self.evicted = 0
+
+    def take(self, key: Hashable, now: Optional[float] = None) -> float:
+        """Spend a token: 0 if admitted, otherwise seconds until one is available"""
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [float(self.burst), now]
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+                self.evicted += 1
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(float(self.burst), bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        return (1 - bucket[0]) / self.rate
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class WorkGate:
+    """Admission in front of a worker pool that sheds work it can't start in time.
+
+    Counts tasks in flight and keeps a moving average of how long one takes,
+    to estimate the wait for a worker. ``enter`` raises Overloaded once that
+    estimate exceeds ``budget`` seconds or ``capacity`` tasks are in flight,
+    so callers fail fast instead of queueing behind work that will time out.
+    """
+
+    def __init__(self, workers: int, capacity: int, budget: float):
+        self.workers = max(workers, 1)
+        self.capacity = max(capacity, self.workers)
+        self.budget = budget
+        self.pending = 0
+        self.service_time = 0.0
+
+    def expected_wait(self) -> float:
+        """Seconds a task admitted now would wait for a free worker"""
+        queued = self.pending - self.workers + 1
+        return max(queued, 0) * self.service_time / self.workers
+
+    def overloaded(self) -> Optional[float]:
+        """Seconds to back off if a new task should be refused, else None"""
+        wait = self.expected_wait()
+        if self.pending >= self.capacity or (self.budget > 0 and wait > self.budget):
+            return max(wait, self.service_time, 1.0)
+        return None
+
+    def enter(self):
+        retry_after = self.overloaded()
+        if retry_after is not None:
+            raise Overloaded(retry_after)
+        self.pending += 1
+
+    def exit(self, service_time: Optional[float] = None):
+        self.pending -= 1
+        if service_time is not None:
+            # Exponential moving average; the first sample seeds it
+            self.service_time = service_time if not self.service_time else 0.8 * self.service_time + 0.2 * service_time
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.pending,
+            "capacity": self.capacity,
+            "service_time": round(self.service_time, 4),
+            "expected_wait": round(self.expected_wait(), 4),
+        }
+
+
+ip_limiter = RateLimiter(settings.admission_ip_rate, settings.admission_ip_burst, settings.admission_max_clients)
+global_limiter = RateLimiter(settings.admission_global_rate, settings.admission_global_burst)
+lookup_limiter = RateLimiter(settings.admission_lookup_rate, settings.admission_lookup_burst, settings.admission_max_clients)
+
+registry.register(Gauge(
+    "skillconnect_admission_tracked_clients", "Client IPs with a rate-limit bucket", lambda: {(): len(ip_limiter)}))
+
+
+def rejection(route: str, reason: str, retry_after: float, api: bool = False) -> Response:
+    """Count a refused request and build its 429 (rate limited) or 503 (overloaded) page, or JSON for ``api``"""
+    admission_rejections.inc(route, reason)
+    status_code = 503 if reason == "overloaded" else 429
+    headers = {"Retry-After": str(max(1, math.ceil(retry_after)))}
+    if api:
+        return JSONResponse({"detail": "Too many requests"}, status_code=status_code, headers=headers)
+    content = """
+    <div class="card" style="max-width: 500px; margin: 2rem auto;">
+        <h2 style="color: red;">Too Many Requests</h2>
+        <p>We're getting more sign-in attempts than we can handle. Please try again shortly.</p>
+    </div>
+    """
+    return HTMLResponse(render_html("Too Many Requests", content), status_code=status_code, headers=headers)
+
+
+def client_ip(scope) -> str:
+    # Behind a proxy, uvicorn's --proxy-headers (app.launcher) puts the address
+    # it forwarded for here; X-Forwarded-For itself is whatever the client sent
+    client = scope.get("client")
+    return client[0] if client else ""
+
+
+class AdmissionMiddleware:
+    """ASGI middleware guarding the CPU-heavy auth routes before any work is done.
+
+    POSTs to ``paths`` spend a token from the client's bucket and from the
+    global bucket (429 if either is empty), and are shed with 503 while
+    ``gate`` (the password worker pool) is over its latency budget.
+
+    GETs to ``lookups`` (cheap, but they reveal which accounts exist) spend
+    a token from the client's bucket in a separate, faster limiter.
+    """
+
+    def __init__(self, app, paths: Iterable[str], gate: WorkGate, lookups: Iterable[str] = ()):
+        self.app = app
+        self.paths = frozenset(paths)
+        self.gate = gate
+        self.lookups = frozenset(lookups)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["method"] == "GET" and scope["path"] in self.lookups:
+            retry_after = lookup_limiter.take(client_ip(scope))
+            if retry_after:
+                return await rejection(scope["path"], "lookup_rate", retry_after, api=True)(scope, receive, send)
+            return await self.app(scope, receive, send)
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            return await self.app(scope, receive, send)
+
+        reason = "ip_rate"
+        retry_after = ip_limiter.take(client_ip(scope))
+        if not retry_after:
+            reason = "global_rate"
+            retry_after = global_limiter.take(GLOBAL)
+        if not retry_after:
+            reason = "overloaded"
+            retry_after = self.gate.overloaded()
+        if retry_after:
+            return await rejection(scope["path"], reason, retry_after)(scope, receive, send)
+        await self.app(scope, receive, send)
@@ -0,0 +1 @@
+# Versioned JSON API routers
@@ -0,0 +1,138 @@
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.auth import get_current_user_optional, get_user_by_username
+from app.database.connection import get_read_db, read_engine
+from app.feed import FEED_COLUMNS, FeedRow, fetch_posts_by_ids, fetch_posts_page
+from app.models import Post, User
+
+STREAM_BATCH_SIZE = 1000
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (several times faster than json.dumps)"""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+
+class PostOut(BaseModel):
+    id: int
+    title: str
+    description: str
+    required_skills: List[str]
+    author: str
+    created_at: datetime
+
+
+class UserOut(BaseModel):
+    username: str
+    full_name: Optional[str] = None
+    skills: List[str]
+    bio: Optional[str] = None
+
+
+class FeedPage(BaseModel):
+    posts: List[PostOut]
+    next_cursor: Optional[str] = None
+
+
+router = APIRouter(prefix="/api/v1", tags=["api v1"], default_response_class=ORJSONResponse)
+
+
+def split_skills(text: Optional[str]) -> List[str]:
+    """Skills as entered, e.g. "Python, Design" -> ["Python", "Design"]"""
+    if not text:
+        return []
+    return [skill.strip() for skill in text.split(",") if skill.strip()]
+
+
+def post_out(post: FeedRow) -> dict:
+    return {
+        "id": post.id,
+        "title": post.title,
+        "description": post.description,
+        "required_skills": split_skills(post.required_skills),
+        "author": post.author_username,
+        "created_at": post.created_at,
+    }
+
+
+def user_out(user) -> dict:
+    return {"username": user.username, "full_name": user.full_name, "skills": split_skills(user.skills), "bio": user.bio}
+
+
+@router.get("/feed", response_model=FeedPage)
+async def feed(
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=100),
+    skill: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Newest posts, one keyset page at a time; pass ``next_cursor`` back as ``cursor``"""
+    posts, next_cursor = await fetch_posts_page(db, cursor=cursor, limit=limit, skill=skill)
+    return {"posts": [post_out(post) for post in posts], "next_cursor": next_cursor}
+
+
+async def stream_posts() -> AsyncIterator[bytes]:
+    # Own connection: the stream outlives the request's dependency-scoped session
+    async with read_engine.connect() as conn:
+        query = (
+            select(*FEED_COLUMNS)
+            .join(User, Post.author_id == User.id)
+            .order_by(Post.id)
+            .execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+        result = await conn.stream(query)
+        async for rows in result.partitions():
+            yield b"".join(orjson.dumps(post_out(FeedRow(*row))) + b"\n" for row in rows)
+
+
+@router.get("/posts/stream", response_class=StreamingResponse, responses={200: {"content": {"application/x-ndjson": {}}}})
+async def posts_stream():
+    """Every post, oldest first, as newline-delimited JSON (one PostOut per line)"""
+    return StreamingResponse(stream_posts(), media_type="application/x-ndjson")
+
+
+@router.get("/posts/{post_id}", response_model=PostOut)
+async def post(post_id: int, db: AsyncSession = Depends(get_read_db)):
+    posts = await fetch_posts_by_ids(db, [post_id])
+    if not posts:
+        raise HTTPException(status_code=404, detail="Post not found")
+    return post_out(posts[0])
+
+
+@router.get("/users/{username}", response_model=UserOut)
+async def user(username: str, db: AsyncSession = Depends(get_read_db)):
+    found = await get_user_by_username(db, username)
+    if found is None or not found.is_active:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user_out(found)
+
+
+@router.get("/users/{username}/posts", response_model=FeedPage)
+async def user_posts(
+    username: str,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+):
+    author_id = (await db.execute(select(User.id).where(User.username == username))).scalar()
+    if author_id is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    posts, next_cursor = await fetch_posts_page(db, cursor=cursor, author_id=author_id, limit=limit)
+    return {"posts": [post_out(post) for post in posts], "next_cursor": next_cursor}
+
+
+@router.get("/me", response_model=UserOut)
+async def me(current=Depends(get_current_user_optional)):
+    if not current:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    return user_out(current)
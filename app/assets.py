@@ -0,0 +1,91 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+from typing import Dict
+
+from starlette.datastructures import Headers
+from starlette.staticfiles import StaticFiles
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+BUILD_PREFIX = "dist"
+COMPRESSIBLE = {".css", ".js", ".svg", ".json", ".txt", ".html"}
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+class AssetPipeline:
+    """Content-hashed, precompressed copies of the files under app/static.
+
+    build() writes ``dist/<path>.<hash>.<ext>`` (plus a ``.gz`` sibling for
+    text assets) next to the sources, skipping files already built, and
+    records the mapping so pages can link the fingerprinted URL.
+    """
+
+    def __init__(self, static_dir: str = STATIC_DIR):
+        self.static_dir = static_dir
+        self.manifest: Dict[str, str] = {}
+
+    def build(self) -> Dict[str, str]:
+        manifest = {}
+        build_root = os.path.join(self.static_dir, BUILD_PREFIX)
+        for root, dirs, files in os.walk(self.static_dir):
+            if os.path.abspath(root) == os.path.abspath(self.static_dir) and BUILD_PREFIX in dirs:
+                dirs.remove(BUILD_PREFIX)
+            for name in files:
+                source = os.path.join(root, name)
+                logical = os.path.relpath(source, self.static_dir).replace(os.sep, "/")
+                with open(source, "rb") as f:
+                    data = f.read()
+                stem, ext = os.path.splitext(logical)
+                hashed = f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}"
+                target = os.path.join(build_root, hashed)
+                if not os.path.exists(target):
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    _write_atomic(target, data)
+                    if ext in COMPRESSIBLE:
+                        _write_atomic(target + ".gz", gzip.compress(data, compresslevel=9, mtime=0))
+                manifest[logical] = f"{BUILD_PREFIX}/{hashed}"
+        self.manifest = manifest
+        return manifest
+
+    def url(self, logical: str) -> str:
+        """Public URL for a static file: fingerprinted once built, plain before that."""
+        return "/static/" + self.manifest.get(logical, logical)
+
+
+def _write_atomic(path: str, data: bytes):
+    # Several workers may build at once; never let one serve another's half-written file
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _media_type(path: str) -> str:
+    media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    return media_type + "; charset=utf-8" if media_type.startswith("text/") else media_type
+
+
+class AssetStaticFiles(StaticFiles):
+    """StaticFiles that serves fingerprinted assets as immutable, gzip-encoded when accepted."""
+
+    async def get_response(self, path: str, scope):
+        fingerprinted = path.replace(os.sep, "/").startswith(BUILD_PREFIX + "/")
+        if fingerprinted and "gzip" in Headers(scope=scope).get("accept-encoding", ""):
+            try:
+                response = await super().get_response(path + ".gz", scope)
+            except Exception:
+                response = None
+            if response is not None and response.status_code in (200, 304):
+                response.headers["Content-Encoding"] = "gzip"
+                response.headers["Content-Type"] = _media_type(path)
+                response.headers["Vary"] = "Accept-Encoding"
+                response.headers["Cache-Control"] = IMMUTABLE
+                return response
+
+        response = await super().get_response(path, scope)
+        response.headers["Cache-Control"] = IMMUTABLE if fingerprinted else "no-cache"
+        return response
+
+
+assets = AssetPipeline()
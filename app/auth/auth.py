@@ -1,34 +1,156 @@
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from app.admission import WorkGate
+from app.cache import TTLCache
 from app.config import settings
-from app.database.connection import get_db
+from app.database.connection import get_read_db
+from app.invalidation import invalidation_log
+from app.metrics import authentications, password_queue, password_work
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache(maxsize=None)
+def pwd_context():
+    """Password hashing context, built on first use to keep passlib off the import path.
+
+    Hashes made with a different cost factor are flagged by verify_and_update
+    and transparently rehashed on the next successful login.
+    """
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.bcrypt_rounds)
+
+
+# Bcrypt is deliberately slow, so it runs in a worker pool instead of on the event loop
+_password_executor: Optional[Executor] = None
+_password_workers = settings.password_workers or os.cpu_count() or 1
+# Refuses password work that would queue past the budget (raises admission.Overloaded)
+password_gate = WorkGate(
+    _password_workers, _password_workers + settings.password_queue_size, settings.password_queue_budget_ms / 1000
+)
 
 # Token authentication
 security = HTTPBearer(auto_error=False)
 
 
+@dataclass(frozen=True, slots=True)
+class CurrentUser:
+    """Slim, read-only snapshot of the signed-in user for rendering pages."""
+    id: int
+    username: str
+    phone: Optional[str]
+    full_name: Optional[str]
+    skills: Optional[str]
+    bio: Optional[str]
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user) -> "CurrentUser":
+        return cls(user.id, user.username, user.phone, user.full_name, user.skills, user.bio, bool(user.is_active))
+
+
+# Token -> CurrentUser, tagged by username so a user's entries can be dropped together
+user_cache = TTLCache(settings.user_cache_size, settings.user_cache_ttl_seconds)
+
+
+def invalidate_user(username: str):
+    """Forget cached snapshots of a user, in every worker; call after updating or deactivating them."""
+    user_cache.invalidate_tag(username)
+    invalidation_log.publish("user_cache", [username])
+
+
+def drop_cached_users(usernames: Optional[List[str]]):
+    """Invalidation log handler: forget users another worker changed (None: all of them)"""
+    if usernames is None:
+        user_cache.clear()
+        return
+    for username in usernames:
+        user_cache.invalidate_tag(username)
+
+
+def _truncate_password(password: str) -> str:
+    """Truncate password to 72 bytes for bcrypt compatibility."""
+    if len(password.encode('utf-8')) > 72:
+        password = password.encode('utf-8')[:72].decode('utf-8', errors='ignore')
+    return password
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against its hash."""
-    # Truncate password to 72 bytes for bcrypt compatibility
-    if len(plain_password.encode('utf-8')) > 72:
-        plain_password = plain_password.encode('utf-8')[:72].decode('utf-8', errors='ignore')
-    return pwd_context.verify(plain_password, hashed_password)
+    return pwd_context().verify(_truncate_password(plain_password), hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password, returning a fresh hash if the stored one uses outdated settings."""
+    return pwd_context().verify_and_update(_truncate_password(plain_password), hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Hash a password."""
-    # Truncate password to 72 bytes for bcrypt compatibility
-    if len(password.encode('utf-8')) > 72:
-        password = password.encode('utf-8')[:72].decode('utf-8', errors='ignore')
-    return pwd_context.hash(password)
+    return pwd_context().hash(_truncate_password(password))
+
+
+def get_password_executor() -> Executor:
+    """Get (or lazily create) the worker pool used for password hashing."""
+    global _password_executor
+    if _password_executor is None:
+        if settings.password_executor == "process":
+            _password_executor = ProcessPoolExecutor(max_workers=_password_workers)
+        else:
+            _password_executor = ThreadPoolExecutor(max_workers=_password_workers, thread_name_prefix="password")
+    return _password_executor
+
+
+def shutdown_password_executor():
+    """Stop the password worker pool."""
+    global _password_executor
+    if _password_executor is not None:
+        _password_executor.shutdown(wait=False, cancel_futures=True)
+    _password_executor = None
+
+
+PASSWORD_OPERATIONS = {get_password_hash: "hash", verify_and_update_password: "verify"}
+
+
+def _timed_call(func, *args):
+    """Run func in a worker and also return how long it took there."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+async def run_password_task(func, *args):
+    """Run password work in the worker pool; raises Overloaded rather than queue past the budget."""
+    password_gate.enter()
+    start = time.perf_counter()
+    work = None
+    try:
+        loop = asyncio.get_running_loop()
+        result, work = await loop.run_in_executor(get_password_executor(), _timed_call, func, *args)
+    finally:
+        password_gate.exit(work)
+    operation = PASSWORD_OPERATIONS.get(func, func.__name__)
+    password_work.observe(work, operation)
+    password_queue.observe(max(0.0, time.perf_counter() - start - work), operation)
+    return result
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password without blocking the event loop."""
+    return await run_password_task(get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password without blocking the event loop (see verify_and_update_password)."""
+    return await run_password_task(verify_and_update_password, plain_password, hashed_password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -40,29 +162,55 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
     
     to_encode.update({"exp": expire})
+    from jose import jwt  # python-jose loads its crypto backends on import; defer to first use
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     return encoded_jwt
 
 
-def get_user_by_username(db: Session, username: str):
+async def get_user_by_username(db: AsyncSession, username: str):
     """Get user by username."""
     from app.models import User
-    return db.query(User).filter(User.username == username).first()
+    result = await db.execute(select(User).where(User.username == username).limit(1))
+    return result.scalars().first()
 
 
-def authenticate_user(db: Session, username: str, password: str):
-    """Authenticate a user."""
-    user = get_user_by_username(db, username)
+async def get_user_by_login(db: AsyncSession, login: str):
+    """Get user by username or phone number (a username match wins if both match).
+
+    One query; both columns are uniquely indexed, so it is two index probes.
+    """
+    from app.models import User
+    result = await db.execute(
+        select(User)
+        .where(or_(User.username == login, User.phone == login))
+        .order_by((User.username == login).desc())
+        .limit(1)
+    )
+    return result.scalars().first()
+
+
+async def authenticate_user(db: AsyncSession, login: str, password: str):
+    """Authenticate a user by username or phone."""
+    start = time.perf_counter()
+    user = await get_user_by_login(db, login)
     if not user:
+        authentications.observe(time.perf_counter() - start, "unknown_user")
         return False
-    if not verify_password(password, user.password_hash):
+    verified, new_hash = await verify_password_async(password, user.password_hash)
+    if not verified:
+        authentications.observe(time.perf_counter() - start, "bad_password")
         return False
+    if new_hash:
+        # Cost factor changed since this hash was made - upgrade it in place
+        user.password_hash = new_hash
+        await db.commit()
+    authentications.observe(time.perf_counter() - start, "ok")
     return user
 
 
-def get_current_user(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get current authenticated user."""
     if not credentials:
@@ -72,6 +220,7 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    from jose import JWTError, jwt
     try:
         payload = jwt.decode(credentials.credentials, settings.secret_key, algorithms=[settings.algorithm])
         username: str = payload.get("sub")
@@ -89,7 +238,7 @@ def get_current_user(
         )
     
     from app.models import User
-    user = get_user_by_username(db, username=username)
+    user = await get_user_by_username(db, username=username)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -99,11 +248,16 @@ def get_current_user(
     return user
 
 
-def get_current_user_optional(
+async def get_current_user_optional(
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get current authenticated user or None if not authenticated."""
+    """Get current authenticated user or None if not authenticated.
+
+    Returns a CurrentUser snapshot. Snapshots are cached per token (bounded by
+    the token's own expiry), so repeat page views skip both the JWT decode and
+    the users lookup.
+    """
     # Try to get token from cookie
     token = request.cookies.get("access_token")
     
@@ -114,6 +268,11 @@ def get_current_user_optional(
     if token.startswith("Bearer "):
         token = token[7:]
     
+    cached = user_cache.get(token)
+    if cached is not None:
+        return cached if cached.is_active else None
+    
+    from jose import JWTError, jwt
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
         username: str = payload.get("sub")
@@ -122,6 +281,13 @@ def get_current_user_optional(
     except JWTError:
         return None
     
-    from app.models import User
-    user = get_user_by_username(db, username=username)
-    return user
\ No newline at end of file
+    user = await get_user_by_username(db, username=username)
+    snapshot = CurrentUser.from_user(user) if user is not None else None
+    # End the lookup's transaction so its pooled connection is free while the
+    # handler runs; write handlers check out a second, primary connection
+    await db.rollback()
+    if snapshot is None:
+        return None
+    expires_in = payload["exp"] - time.time() if "exp" in payload else None
+    user_cache.put(token, snapshot, tag=username, expires_in=expires_in)
+    return snapshot if snapshot.is_active else None
\ No newline at end of file
@@ -0,0 +1,129 @@
+"""Bloom filter of taken usernames and phone numbers.
+
+Both are login names (see get_user_by_login), so they share one namespace:
+a new username may not equal anyone's phone, nor a new phone anyone's
+username. The filter holds the plain values and one probe covers both.
+
+Signup and the live /api/availability check ask "is this name taken?" far
+more often than the answer is yes. A Bloom filter never misses a name it
+holds, so a negative answers "free" from memory; only positives (taken,
+or a LOGIN_BLOOM_ERROR_RATE false positive) are confirmed in the database.
+
+Each worker fills its filter from the users table at startup and adds the
+users it registers. It learns other workers' registrations, and users
+added by app.bulk, through the invalidation log, so a name taken elsewhere
+within the last poll interval can read as free. The unique constraints
+still refuse it at commit, so the only cost is a later error message.
+Names are never removed: a freed name stays a harmless false positive
+until the next restart.
+"""
+import hashlib
+import math
+from typing import Iterable, List, Optional
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import User
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings, sized for ``capacity`` keys at ``error_rate``"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        # Double hashing: k positions from the two halves of one digest
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class LoginFilter:
+    """Taken login names: every registered username and phone number.
+
+    Until load() has run every name reads as possibly taken, so callers fall
+    back to querying the database.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.filter: Optional[BloomFilter] = None
+        self.checks = 0
+        self.skipped = 0
+        self.false_positives = 0
+
+    @staticmethod
+    def keys(username: Optional[str] = None, phone: Optional[str] = None) -> List[str]:
+        return [value for value in (username, phone) if value]
+
+    async def load(self, db: AsyncSession):
+        """Build the filter from every registered user (sized for at least twice their usernames and phones)"""
+        rows = (await db.execute(select(User.username, User.phone))).all()
+        keys = [key for username, phone in rows for key in self.keys(username, phone)]
+        bloom = BloomFilter(max(self.capacity, 2 * len(keys)), self.error_rate)
+        for key in keys:
+            bloom.add(key)
+        self.filter = bloom
+
+    def add_keys(self, keys: Iterable[str]):
+        if self.filter is not None:
+            for key in keys:
+                self.filter.add(key)
+
+    def might_be_taken(self, key: str) -> bool:
+        if self.filter is None:
+            return True
+        self.checks += 1
+        if key in self.filter:
+            return True
+        self.skipped += 1
+        return False
+
+    async def taken(self, db: AsyncSession, username: Optional[str] = None, phone: Optional[str] = None) -> List[str]:
+        """Which of "username" / "phone" are already someone's username or phone.
+
+        One query at most, none when the filter misses both.
+        """
+        checked = {field: value for field, value in (("username", username), ("phone", phone))
+                   if value and self.might_be_taken(value)}
+        if not checked:
+            return []
+        values = set(checked.values())
+        rows = (await db.execute(
+            select(User.username, User.phone).where(or_(User.username.in_(values), User.phone.in_(values))).limit(4)
+        )).all()
+        in_use = {row.username for row in rows} | {row.phone for row in rows}
+        taken = [field for field, value in checked.items() if value in in_use]
+        if self.filter is not None:
+            self.false_positives += len(checked) - len(taken)
+        return taken
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self.filter is not None,
+            "entries": self.filter.count if self.filter else 0,
+            "bits": self.filter.size if self.filter else 0,
+            "checks": self.checks,
+            "db_lookups_skipped": self.skipped,
+            "false_positives": self.false_positives,
+        }
+
+
+login_filter = LoginFilter(settings.login_bloom_capacity, settings.login_bloom_error_rate)
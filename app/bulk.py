@@ -0,0 +1,338 @@
+"""Bulk import and export of users and posts.
+
+    python -m app.bulk import users cohort.csv
+    python -m app.bulk import posts ideas.jsonl --chunk-size 2000
+    python -m app.bulk export posts posts.jsonl
+    python -m app.bulk export users - --format csv > users.csv
+
+Files are CSV (with a header row) or JSON Lines, picked from the extension
+or --format; "-" means stdin/stdout. Rows are read, written and inserted in
+chunks, so memory stays flat however large the file is.
+
+User columns: username, password (or an existing bcrypt password_hash),
+phone, full_name, skills, bio. Post columns: title, description,
+required_skills, author (username) or author_id, created_at.
+Users whose username or phone is already someone's username or phone
+(both are login names), posts whose author is
+unknown, and rows with a malformed created_at or author_id are skipped
+and counted. Export users with --include-password-hash to re-import them
+elsewhere.
+
+Each imported chunk is published on the invalidation log: usernames and
+phones on "logins", user ids on "user_skills" and post ids on "posts", so
+running workers stop offering the names in /api/availability and add the
+rows to their matching index and feed. Set INVALIDATION_LOG to the
+servers' log file (app.launcher --invalidation-log) for that to reach them.
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
+
+from sqlalchemy import insert, or_, select
+
+from app.auth.auth import get_password_hash
+from app.database.connection import engine, init_db
+from app.invalidation import invalidation_log
+from app.models import Post, User, post_skills, user_skills
+from app.skills import link_skills
+
+USER_FIELDS = ["username", "phone", "full_name", "skills", "bio", "is_active", "created_at"]
+POST_FIELDS = ["id", "title", "description", "required_skills", "author", "author_id", "created_at"]
+
+
+def detect_format(path: str, given: Optional[str]) -> str:
+    if given:
+        return given
+    if path.endswith((".jsonl", ".ndjson", ".json")):
+        return "jsonl"
+    if path.endswith(".csv"):
+        return "csv"
+    raise SystemExit(f"Can't tell the format of {path!r}; pass --format csv or --format jsonl")
+
+
+def read_rows(stream, fmt: str) -> Iterator[dict]:
+    """Yield one dict per CSV row / JSON line, lazily"""
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def chunks(rows: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _clean(value) -> Optional[str]:
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _parse_datetime(value) -> Optional[datetime]:
+    """ISO 8601 timestamp as naive UTC, or None if blank; raises ValueError if malformed"""
+    value = _clean(value)
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _parse_id(value) -> Optional[int]:
+    """Integer id or None if blank; raises ValueError if malformed"""
+    value = _clean(value)
+    return int(value) if value else None
+
+
+def _fill_created_at(values: List[dict]):
+    # Every row in an executemany must bind the same columns
+    if any("created_at" in value for value in values):
+        now = datetime.utcnow().replace(microsecond=0)
+        for value in values:
+            value.setdefault("created_at", now)
+
+
+class ImportStats:
+    def __init__(self):
+        self.inserted = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.start = time.perf_counter()
+
+    def report(self, kind: str) -> str:
+        elapsed = time.perf_counter() - self.start
+        rate = self.inserted / elapsed if elapsed else 0
+        return (
+            f"{kind}: {self.inserted} inserted, {self.duplicates} duplicates skipped, "
+            f"{self.invalid} invalid skipped in {elapsed:.1f}s ({rate:.0f}/s)"
+        )
+
+
+async def import_users(rows: Iterable[dict], chunk_size: int, workers: int, echo=print) -> ImportStats:
+    stats = ImportStats()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        loop = asyncio.get_running_loop()
+        for chunk in chunks(rows, chunk_size):
+            # Dedupe within the chunk first, then against the table with one query. Usernames and
+            # phones share one login namespace, so each is checked against both columns.
+            candidates, seen = [], set()
+            for row in chunk:
+                username, phone = _clean(row.get("username")), _clean(row.get("phone"))
+                try:
+                    created_at = _parse_datetime(row.get("created_at"))
+                except ValueError:
+                    stats.invalid += 1
+                    continue
+                if not username or not (_clean(row.get("password")) or _clean(row.get("password_hash"))):
+                    stats.invalid += 1
+                elif username in seen or (phone and phone in seen):
+                    stats.duplicates += 1
+                else:
+                    seen.add(username)
+                    if phone:
+                        seen.add(phone)
+                    candidates.append((username, phone, created_at, row))
+            if not candidates:
+                continue
+
+            async with engine.connect() as conn:
+                rows = (await conn.execute(
+                    select(User.username, User.phone).where(or_(User.username.in_(seen), User.phone.in_(seen))))).all()
+            taken = {username for username, _ in rows} | {phone for _, phone in rows}
+            fresh = [
+                (username, phone, created_at, row) for username, phone, created_at, row in candidates
+                if username not in taken and not (phone and phone in taken)
+            ]
+            stats.duplicates += len(candidates) - len(fresh)
+            if not fresh:
+                continue
+
+            # Hash only the rows that need it, spread over every worker process
+            to_hash = [row["password"] for _, _, _, row in fresh if not _clean(row.get("password_hash"))]
+            hashes = iter(await loop.run_in_executor(
+                None, lambda: list(pool.map(get_password_hash, to_hash, chunksize=max(1, len(to_hash) // (workers * 4))))
+            ))
+
+            values = []
+            for username, phone, created_at, row in fresh:
+                value = {
+                    "username": username,
+                    "phone": phone,
+                    "password_hash": _clean(row.get("password_hash")) or next(hashes),
+                    "full_name": _clean(row.get("full_name")),
+                    "skills": _clean(row.get("skills")),
+                    "bio": _clean(row.get("bio")),
+                    "is_active": True,
+                }
+                if created_at:
+                    value["created_at"] = created_at
+                values.append(value)
+            _fill_created_at(values)
+
+            async with engine.begin() as conn:
+                result = await conn.execute(
+                    insert(User).returning(User.id, User.username, sort_by_parameter_order=True), values
+                )
+                ids = {username: user_id for user_id, username in result}
+                await conn.run_sync(link_skills, user_skills, "user_id", {ids[v["username"]]: v["skills"] for v in values})
+            invalidation_log.publish("logins", [login for v in values for login in (v["username"], v["phone"]) if login])
+            invalidation_log.publish("user_skills", ids.values())
+            stats.inserted += len(values)
+            echo(stats.report("users"))
+    return stats
+
+
+async def import_posts(rows: Iterable[dict], chunk_size: int, echo=print) -> ImportStats:
+    stats = ImportStats()
+    for chunk in chunks(rows, chunk_size):
+        # Parse first: a malformed author_id or created_at skips just that row
+        parsed = []
+        for row in chunk:
+            try:
+                author_id = None if _clean(row.get("author")) else _parse_id(row.get("author_id"))
+                parsed.append((row, author_id, _parse_datetime(row.get("created_at"))))
+            except ValueError:
+                stats.invalid += 1
+
+        # Resolve authors (by username or id) with one query per chunk
+        usernames = {_clean(row.get("author")) for row, _, _ in parsed} - {None}
+        ids = {author_id for _, author_id, _ in parsed} - {None}
+        authors, author_ids = {}, set()
+        async with engine.connect() as conn:
+            if usernames:
+                authors = dict((await conn.execute(
+                    select(User.username, User.id).where(User.username.in_(usernames)))).all())
+            if ids:
+                author_ids = set((await conn.execute(select(User.id).where(User.id.in_(ids)))).scalars())
+
+        values = []
+        for row, author_id, created_at in parsed:
+            title, description = _clean(row.get("title")), _clean(row.get("description"))
+            if _clean(row.get("author")):
+                author_id = authors.get(_clean(row.get("author")))
+            elif author_id not in author_ids:
+                author_id = None
+            if not title or not description or author_id is None:
+                stats.invalid += 1
+                continue
+            value = {
+                "title": title,
+                "description": description,
+                "required_skills": _clean(row.get("required_skills")),
+                "author_id": author_id,
+            }
+            if created_at:
+                value["created_at"] = created_at
+            values.append(value)
+        if not values:
+            continue
+        _fill_created_at(values)
+
+        async with engine.begin() as conn:
+            result = await conn.execute(insert(Post).returning(Post.id, sort_by_parameter_order=True), values)
+            post_ids = result.scalars().all()
+            await conn.run_sync(link_skills, post_skills, "post_id", {
+                post_id: value["required_skills"] for post_id, value in zip(post_ids, values)
+            })
+        invalidation_log.publish("posts", post_ids)
+        stats.inserted += len(values)
+        echo(stats.report("posts"))
+    return stats
+
+
+def _row_value(value):
+    return value.isoformat(sep=" ") if isinstance(value, datetime) else value
+
+
+async def export_rows(kind: str, out, fmt: str, chunk_size: int, include_password_hash: bool = False) -> int:
+    """Stream every user/post to ``out`` with a server-side cursor; returns the row count"""
+    if kind == "users":
+        fields = USER_FIELDS + (["password_hash"] if include_password_hash else [])
+        query = select(*(getattr(User, name) for name in fields)).order_by(User.id)
+    else:
+        fields = POST_FIELDS
+        query = (
+            select(Post.id, Post.title, Post.description, Post.required_skills,
+                   User.username.label("author"), Post.author_id, Post.created_at)
+            .join(User, Post.author_id == User.id)
+            .order_by(Post.id)
+        )
+
+    writer = csv.writer(out) if fmt == "csv" else None
+    if writer:
+        writer.writerow(fields)
+    count = 0
+    async with engine.connect() as conn:
+        result = await conn.stream(query.execution_options(yield_per=chunk_size))
+        async for partition in result.partitions():
+            if writer:
+                writer.writerows([[_row_value(value) for value in row] for row in partition])
+            else:
+                out.writelines(
+                    json.dumps(dict(zip(fields, map(_row_value, row))), ensure_ascii=False) + "\n" for row in partition
+                )
+            count += len(partition)
+    return count
+
+
+def _open(path: str, mode: str):
+    if path == "-":
+        return sys.stdin if "r" in mode else sys.stdout
+    return open(path, mode, newline="", encoding="utf-8")
+
+
+async def run(args):
+    await init_db()
+    fmt = detect_format(args.path, args.format) if args.path != "-" else (args.format or "jsonl")
+    # Progress goes to stderr so exports to stdout stay clean
+    echo = lambda line: print(line, file=sys.stderr)  # noqa: E731
+    try:
+        if args.command == "import":
+            with _open(args.path, "r") as stream:
+                rows = read_rows(stream, fmt)
+                if args.kind == "users":
+                    stats = await import_users(rows, args.chunk_size, args.workers or os.cpu_count() or 1, echo)
+                else:
+                    stats = await import_posts(rows, args.chunk_size, echo)
+            echo("done - " + stats.report(args.kind))
+        else:
+            start = time.perf_counter()
+            with _open(args.path, "w") as out:
+                count = await export_rows(args.kind, out, fmt, args.chunk_size, args.include_password_hash)
+            echo(f"{args.kind}: {count} exported in {time.perf_counter() - start:.1f}s")
+    finally:
+        await engine.dispose()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.bulk", description="Bulk import/export of users and posts")
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("kind", choices=["users", "posts"])
+    parser.add_argument("path", help='CSV or JSONL file, or "-" for stdin/stdout')
+    parser.add_argument("--format", choices=["csv", "jsonl"])
+    parser.add_argument("--chunk-size", type=int, default=1000, help="rows per insert batch / export fetch")
+    parser.add_argument("--workers", type=int, default=0, help="password hashing processes (default: one per core)")
+    parser.add_argument("--include-password-hash", action="store_true", help="export users with their password hashes")
+    asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
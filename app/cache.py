@@ -0,0 +1,156 @@
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.utils import formatdate
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+
+from app.config import settings
+
+
+@dataclass(frozen=True, slots=True)
+class CachedPage:
+    """Rendered response body with its validators."""
+    body: str
+    etag: str
+    last_modified: str
+
+
+class FeedCache:
+    """Bounded LRU of rendered feed output, emptied whenever the feed changes.
+
+    Holds both full anonymous pages and the user-independent post-list
+    fragments that logged-in pages are assembled from. Read ``generation``
+    before fetching what a page is built from and pass it to put(): a page
+    built from rows read before an invalidation is then served but not kept.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, CachedPage]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.stale_puts = 0
+        self.generation = 0
+        self._last_modified = formatdate(time.time(), usegmt=True)
+
+    def get(self, key: Hashable) -> Optional[CachedPage]:
+        page = self._entries.get(key)
+        if page is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return page
+
+    def put(self, key: Hashable, body: str, generation: Optional[int] = None) -> CachedPage:
+        digest = hashlib.sha256(body.encode()).hexdigest()[:32]
+        page = CachedPage(body, f'"{digest}"', self._last_modified)
+        if generation is not None and generation != self.generation:
+            # Invalidated while the page was being built: it may predate the change
+            self.stale_puts += 1
+            return page
+        self._entries[key] = page
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return page
+
+    def invalidate(self):
+        """Drop everything; called after a post is committed."""
+        self._entries.clear()
+        self.invalidations += 1
+        self.generation += 1
+        self._last_modified = formatdate(time.time(), usegmt=True)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "stale_puts": self.stale_puts,
+        }
+
+
+def not_modified(page: CachedPage, if_none_match: Optional[str], if_modified_since: Optional[str]) -> bool:
+    """Whether a conditional request's validators still match the cached page."""
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or page.etag in tags
+    return if_modified_since is not None and if_modified_since == page.last_modified
+
+
+class TTLCache:
+    """Bounded LRU whose entries also expire, and can be dropped by tag.
+
+    Each entry carries its own deadline (never later than ``ttl`` seconds
+    from insertion) and an optional tag, so every entry for one subject can
+    be invalidated at once. ``max_entries=0`` disables caching.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, Hashable]]" = OrderedDict()
+        self._tags: Dict[Hashable, Set[Hashable]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry[0] <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: Hashable, value: Any, tag: Hashable = None, expires_in: Optional[float] = None):
+        if self.max_entries <= 0:
+            return
+        ttl = self.ttl if expires_in is None else min(self.ttl, expires_in)
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + ttl, value, tag)
+        if tag is not None:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate_tag(self, tag: Hashable):
+        for key in self._tags.pop(tag, ()):
+            self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+        self._tags.clear()
+
+    def _remove(self, key: Hashable):
+        _, _, tag = self._entries.pop(key)
+        keys = self._tags.get(tag)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._tags[tag]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+feed_cache = FeedCache(settings.feed_cache_size)
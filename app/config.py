@@ -5,17 +5,78 @@ from typing import Optional
 class Settings(BaseSettings):
     # Database - defaults to SQLite for easy setup
     database_url: str = "sqlite:///./skillconnect.db"
+    read_database_url: Optional[str] = None  # Replica for GET handlers; unset = read from the primary
+    read_sticky_seconds: float = 5  # After a client writes, its reads go to the primary this long
+    db_profile: str = "auto"  # "sqlite", "server", "default" (library defaults) or "auto" (from the URL)
+    db_auto_migrate: bool = True  # False: refuse to boot on an outdated schema instead of migrating it
+    # "sqlite" profile
+    sqlite_journal_mode: str = "wal"
+    sqlite_synchronous: str = "normal"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size: int = -65536  # negative = KiB, so 64 MiB of page cache per connection
+    sqlite_mmap_size: int = 268435456
+    # "server" profile (Postgres)
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: float = 30
+    db_pool_pre_ping: bool = True
+    db_pool_recycle: int = 1800
+    db_pool_warm: int = 0  # Connections each worker opens at startup, before taking requests
     
     # Security
     secret_key: str = "your-secret-key-change-this-in-production"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 1440
+    user_cache_size: int = 10000  # 0 disables the authenticated-user cache
+    user_cache_ttl_seconds: float = 60
+
+    # Password hashing
+    bcrypt_rounds: int = 12
+    password_executor: str = "thread"  # "thread" or "process"
+    password_workers: int = 0  # 0 = one worker per CPU core
+    password_queue_size: int = 32
+    password_queue_budget_ms: float = 1000  # Shed password work expected to wait longer for a worker (0 = never)
+
+    # Admission control for POST /login and /register, and GET /api/availability
+    # (rates in requests per second, 0 disables)
+    admission_enabled: bool = True
+    admission_ip_rate: float = 1
+    admission_ip_burst: int = 20
+    admission_global_rate: float = 100
+    admission_global_burst: int = 200
+    admission_lookup_rate: float = 2  # Per client IP, for /api/availability
+    admission_lookup_burst: int = 20
+    admission_max_clients: int = 50000  # Most client IPs tracked at once (LRU)
+    login_bloom_enabled: bool = True  # Answer most username/phone availability checks from memory
+    login_bloom_capacity: int = 100000  # Names the filter is sized for (at least twice the names at startup)
+    login_bloom_error_rate: float = 0.001  # Share of free names that still cost a query
     
     # App
     app_name: str = "SkillConnect"
     debug: bool = True
     host: str = "0.0.0.0"
     port: int = 8000
+    feed_page_size: int = 20
+    search_max_page: int = 50
+    search_rank_window: int = 5000
+    match_limit: int = 10
+    feed_cache_size: int = 256
+    stream_html_pages: bool = False  # Stream long post lists instead of buffering whole pages
+    post_write_mode: str = "direct"  # "direct" (commit per request) or "group" (batched group commit)
+    post_batch_size: int = 100  # Group commit: most posts per transaction
+    post_batch_window_ms: float = 5  # Group commit: longest wait for a batch to fill
+    post_commit_durability: str = "default"  # Group commit: "default" (engine setting), "full" or "relaxed" (SQLite: WAL only)
+    timeline_enabled: bool = True  # Logged-in home page shows posts matching the user's skills
+    timeline_fanout_cap: int = 10000  # Most timelines one post is written to (users sharing most skills first)
+    timeline_backfill_per_user: int = 200  # Matching posts copied into a new or backfilled timeline
+    timeline_batch_size: int = 50  # Fan-out jobs per transaction
+    timeline_max_entries: int = 1000  # Newest entries kept per timeline, older ones pruned on fan-out (0 = all)
+    metrics_enabled: bool = True  # Per-route/SQL instrumentation and GET /metrics
+    event_loop_lag_interval: float = 0.5  # Seconds between event-loop lag probes (0 disables)
+    invalidation_log: Optional[str] = None  # SQLite file shared by workers for cache invalidation (set by app.launcher)
+    invalidation_poll_interval: float = 0.1  # Seconds between polls of the invalidation log
+    invalidation_retention_seconds: float = 300  # Log rows older than this are pruned
+    gzip_min_size: int = 1024  # Compress responses at least this many bytes (0 compresses everything)
 
     class Config:
         env_file = ".env"
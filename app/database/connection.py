@@ -1,31 +1,214 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+import time
+from contextlib import AsyncExitStack
+
+from sqlalchemy import event
+from starlette.requests import Request
+from starlette.responses import Response
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.config import settings
 
 # Base class for models
 Base = declarative_base()
 
-# Create SQLAlchemy engine
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {}
+
+def to_async_url(url: str) -> str:
+    """Map a plain database URL onto its async driver (aiosqlite / asyncpg)."""
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    if url.startswith("postgresql:"):
+        return "postgresql+asyncpg:" + url[len("postgresql:"):]
+    if url.startswith("postgres:"):
+        return "postgresql+asyncpg:" + url[len("postgres:"):]
+    return url
+
+
+class PoolStats:
+    """Time spent waiting for a pooled connection (includes opening new ones)"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, seconds: float):
+        self.checkouts += 1
+        self.total_wait += seconds
+        if seconds > self.max_wait:
+            self.max_wait = seconds
+
+    def snapshot(self, pool=None) -> dict:
+        stats = {
+            "checkouts": self.checkouts,
+            "avg_wait_ms": round(1000 * self.total_wait / self.checkouts, 3) if self.checkouts else 0.0,
+            "max_wait_ms": round(1000 * self.max_wait, 3),
+        }
+        if pool is not None:
+            stats["pool"] = pool.status()
+        return stats
+
+
+pool_stats = PoolStats()
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited in ``stats``"""
+
+    stats = pool_stats
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.stats.record(time.perf_counter() - start)
+
+
+def is_memory_sqlite(url: str) -> bool:
+    return url.startswith("sqlite") and (url.endswith(":memory:") or url.split("://", 1)[-1] in ("", "/"))
+
+
+def resolve_profile(url: str, profile: str) -> str:
+    """Pick the engine profile: "sqlite", "server" or "default" (library defaults)"""
+    if profile == "auto":
+        return "sqlite" if url.startswith("sqlite") else "server"
+    if profile not in ("sqlite", "server", "default"):
+        raise ValueError(f"Unknown DB_PROFILE {profile!r}")
+    return profile
+
+
+def engine_options(url: str, profile: str) -> dict:
+    """create_engine keyword arguments for a profile"""
+    options = {}
+    if is_memory_sqlite(url):
+        # In-memory databases live in a single static connection; nothing to pool
+        return options
+    options["poolclass"] = TimedQueuePool
+    if profile == "server":
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_pre_ping=settings.db_pool_pre_ping,
+            pool_recycle=settings.db_pool_recycle,
+        )
+    return options
+
+
+def sqlite_pragmas() -> list:
+    # busy_timeout goes first so the remaining pragmas wait out other writers too
+    return [
+        f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}",
+        f"PRAGMA journal_mode={settings.sqlite_journal_mode}",
+        f"PRAGMA synchronous={settings.sqlite_synchronous}",
+        f"PRAGMA cache_size={int(settings.sqlite_cache_size)}",
+        f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}",
+    ]
+
+
+def create_engine_for(url: str, profile: str = "auto"):
+    """Async engine for a database URL, tuned by the named profile"""
+    url = to_async_url(url)
+    profile = resolve_profile(url, profile)
+    new_engine = create_async_engine(url, **engine_options(url, profile))
+    if profile == "sqlite" and url.startswith("sqlite"):
+        pragmas = sqlite_pragmas()
+
+        @event.listens_for(new_engine.sync_engine, "connect")
+        def _apply_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for pragma in pragmas:
+                cursor.execute(pragma)
+            cursor.close()
+
+    return new_engine
+
+
+# Create async SQLAlchemy engine
+engine = create_engine_for(settings.database_url, settings.db_profile)
+
+# Create SessionLocal class. Objects stay loaded after commit so handlers can
+# keep reading them without triggering implicit (blocking) refreshes.
+SessionLocal = async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
+# Optional read replica. Without READ_DATABASE_URL reads share the primary.
+read_engine = create_engine_for(settings.read_database_url, settings.db_profile) if settings.read_database_url else engine
+ReadSessionLocal = (
+    async_sessionmaker(read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    if settings.read_database_url
+    else SessionLocal
 )
 
-# Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Set on a client after it commits, so its next reads see its own writes
+STICKY_COOKIE = "primary_until"
 
 
 # Dependency to get DB session
-def get_db():
-    db = SessionLocal()
+async def get_db():
+    async with SessionLocal() as db:
+        yield db
+
+
+def reads_from_primary(request: Request) -> bool:
+    """True while the client's read-your-writes window is open"""
     try:
+        return float(request.cookies.get(STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+# Dependency for handlers that only read: replica session, or the primary
+# right after this client's own write
+def read_sessions(request: Request) -> async_sessionmaker:
+    """Session factory for this client's reads: the replica, or the primary right after a write"""
+    return SessionLocal if reads_from_primary(request) else ReadSessionLocal
+
+
+async def get_read_db(request: Request):
+    async with read_sessions(request)() as db:
         yield db
-    finally:
-        db.close()
+
+
+def stick_to_primary(response: Response) -> Response:
+    """Route this client's reads to the primary for READ_STICKY_SECONDS after a write"""
+    if settings.read_database_url and settings.read_sticky_seconds > 0:
+        response.set_cookie(
+            STICKY_COOKIE,
+            f"{time.time() + settings.read_sticky_seconds:.3f}",
+            max_age=int(settings.read_sticky_seconds) + 1,
+            httponly=True,
+            samesite="lax",
+        )
+    return response
+
+
+async def warm_pool(target_engine, connections: int):
+    """Open pooled connections up front so the first requests don't pay for connecting"""
+    pool = target_engine.sync_engine.pool
+    if connections <= 0 or not hasattr(pool, "size"):
+        return
+    async with AsyncExitStack() as stack:
+        for _ in range(min(connections, pool.size())):
+            conn = await stack.enter_async_context(target_engine.connect())
+            await conn.exec_driver_sql("SELECT 1")
 
 
 # Initialize database
 async def init_db():
-    """Create all database tables"""
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    """Bring the schema up to date; one version lookup when it already is"""
+    # Imported here because the migrations (and the models they use) import this module
+    from app.database.migrations import SCHEMA_VERSION, current_version, run_migrations
+
+    async with engine.connect() as conn:
+        version = await conn.run_sync(current_version)
+    if version == SCHEMA_VERSION:
+        return
+    if version < SCHEMA_VERSION and not settings.db_auto_migrate:
+        raise RuntimeError(
+            f"Database schema is at version {version}, this code needs {SCHEMA_VERSION}; "
+            "run python -m app.database.migrations"
+        )
+    async with engine.begin() as conn:
+        await conn.run_sync(run_migrations)
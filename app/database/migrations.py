@@ -0,0 +1,110 @@
+"""Numbered schema and data migrations, tracked in a one-row schema_version table.
+
+init_db compares that number with SCHEMA_VERSION on every boot and only runs
+the steps in between, so an up-to-date database costs one lookup instead of
+create_all inspecting every table. Run them ahead of a deploy with
+
+    python -m app.database.migrations
+"""
+import asyncio
+import logging
+
+from sqlalchemy import Column, Integer, MetaData, Table, exists, insert, inspect, select, update
+
+from app.database.connection import Base, engine
+from app.models import Post, User, post_skills, user_skills
+from app.search import install_search_index
+from app.skills import get_or_create_skill_ids, parse_skills
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+# Kept out of Base.metadata so create_all never touches it
+schema_version = Table("schema_version", MetaData(), Column("version", Integer, nullable=False))
+
+
+def create_schema(conn):
+    """Create missing tables, and indexes added to tables that already exist."""
+    Base.metadata.create_all(conn)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+def _backfill_links(conn, model, text_column, table, owner_column: str):
+    """Index skills for rows that have skill text but no association rows yet."""
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            select(model.id, text_column)
+            .where(model.id > last_id, text_column.isnot(None))
+            .where(~exists().where(table.c[owner_column] == model.id))
+            .order_by(model.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        parsed = [(owner_id, parse_skills(text)) for owner_id, text in rows]
+        skill_ids = get_or_create_skill_ids(conn, (name for _, names in parsed for name in names))
+        links = [
+            {owner_column: owner_id, "skill_id": skill_ids[name]}
+            for owner_id, names in parsed
+            for name in names
+        ]
+        if links:
+            conn.execute(insert(table), links)
+        last_id = rows[-1][0]
+
+
+def backfill_skills(conn):
+    """Populate user_skills / post_skills from the comma-separated skills text columns."""
+    _backfill_links(conn, User, User.skills, user_skills, "user_id")
+    _backfill_links(conn, Post, Post.required_skills, post_skills, "post_id")
+
+
+# MIGRATIONS[n - 1] takes the schema from version n - 1 to n. Append new steps
+# (a model with new tables or indexes appends create_schema again); never edit
+# or reorder released ones. Every step is idempotent, so databases from before
+# schema_version existed start at 0 and replay them all.
+MIGRATIONS = [
+    create_schema,  # 1
+    backfill_skills,  # 2
+    install_search_index,  # 3
+    create_schema,  # 4: timeline_entries (fill with python -m app.timeline backfill)
+]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def current_version(conn) -> int:
+    """Schema version recorded in the database (0 if it has never been migrated)"""
+    if not inspect(conn).has_table(schema_version.name):
+        return 0
+    return conn.execute(select(schema_version.c.version)).scalar() or 0
+
+
+def run_migrations(conn) -> int:
+    """Apply every step past the recorded version, in the caller's transaction; returns the old version"""
+    version = current_version(conn)
+    if version > SCHEMA_VERSION:
+        raise RuntimeError(f"Database schema version {version} is newer than this code ({SCHEMA_VERSION})")
+    for number in range(version + 1, SCHEMA_VERSION + 1):
+        logger.info("Applying migration %d: %s", number, MIGRATIONS[number - 1].__name__)
+        MIGRATIONS[number - 1](conn)
+    if version == 0:
+        schema_version.create(conn, checkfirst=True)
+        conn.execute(insert(schema_version).values(version=SCHEMA_VERSION))
+    elif version < SCHEMA_VERSION:
+        conn.execute(update(schema_version).values(version=SCHEMA_VERSION))
+    return version
+
+
+async def main():
+    async with engine.begin() as conn:
+        version = await conn.run_sync(run_migrations)
+    await engine.dispose()
+    print(f"schema version {version} -> {SCHEMA_VERSION}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,140 @@
+import base64
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import Post, Skill, User, post_skills
+from app.skills import canonicalize_skill
+
+@dataclass(frozen=True, slots=True)
+class FeedRow:
+    """Read-only post row for rendering, with the author's username already joined in."""
+    id: int
+    title: str
+    description: str
+    required_skills: Optional[str]
+    created_at: datetime
+    author_username: str
+
+
+FEED_COLUMNS = (
+    Post.id,
+    Post.title,
+    Post.description,
+    Post.required_skills,
+    Post.created_at,
+    User.username,
+)
+
+
+def encode_cursor(post) -> str:
+    """Encode a post's (created_at, id) position as an opaque cursor.
+
+    The timestamp keeps full precision (microseconds, UTC offset): on Postgres
+    rows share a second, and a truncated cursor would skip the rest of it.
+    """
+    raw = f"{post.created_at.isoformat()}|{post.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    """Decode a cursor back into (created_at, id), or None if missing or malformed."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, post_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(post_id)
+    except ValueError:
+        return None
+
+
+def posts_page_query(
+    cursor: Optional[str] = None,
+    author_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    skill: Optional[str] = None,
+):
+    """Build the keyset query for one feed page, fetching one extra row to detect a next page."""
+    limit = limit or settings.feed_page_size
+    query = select(*FEED_COLUMNS).join(User, Post.author_id == User.id)
+    if author_id is not None:
+        query = query.where(Post.author_id == author_id)
+    if skill:
+        query = (
+            query.join(post_skills, post_skills.c.post_id == Post.id)
+            .join(Skill, Skill.id == post_skills.c.skill_id)
+            .where(Skill.name == canonicalize_skill(skill))
+        )
+    position = decode_cursor(cursor)
+    if position:
+        query = query.where(tuple_(Post.created_at, Post.id) < position)
+    return query.order_by(Post.created_at.desc(), Post.id.desc()).limit(limit + 1)
+
+
+async def fetch_posts_page(
+    db: AsyncSession,
+    cursor: Optional[str] = None,
+    author_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    skill: Optional[str] = None,
+) -> Tuple[List[FeedRow], Optional[str]]:
+    """Get one page of posts, newest first, and the cursor for the next page.
+
+    Seeks past the cursor on (created_at, id) instead of using OFFSET, so every
+    page is a single range scan on ix_posts_created_at_id (or the per-author index).
+    Authors are joined in the same statement and rows come back as FeedRow tuples
+    rather than ORM entities. ``skill`` restricts the page to posts requiring that
+    skill, resolved through the post_skills index.
+    """
+    limit = limit or settings.feed_page_size
+    result = await db.execute(posts_page_query(cursor, author_id, limit, skill))
+    posts = [FeedRow(*row) for row in result]
+    next_cursor = None
+    if len(posts) > limit:
+        posts = posts[:limit]
+        next_cursor = encode_cursor(posts[-1])
+    return posts, next_cursor
+
+
+class PostPageStream:
+    """One feed page read row by row from a server-side cursor.
+
+    Iterate it to get FeedRows as the database produces them; ``next_cursor``
+    is known once iteration finishes. Takes the same filters as fetch_posts_page.
+    """
+
+    def __init__(self, db: AsyncSession, cursor: Optional[str] = None, author_id: Optional[int] = None,
+                 limit: Optional[int] = None, skill: Optional[str] = None):
+        self.db = db
+        self.limit = limit or settings.feed_page_size
+        self.query = posts_page_query(cursor, author_id, self.limit, skill)
+        self.next_cursor: Optional[str] = None
+        self.count = 0
+
+    async def __aiter__(self):
+        result = await self.db.stream(self.query)
+        try:
+            last = None
+            async for row in result:
+                if self.count == self.limit:
+                    self.next_cursor = encode_cursor(last)
+                    break
+                last = FeedRow(*row)
+                self.count += 1
+                yield last
+        finally:
+            await result.close()
+
+
+async def fetch_posts_by_ids(db: AsyncSession, post_ids: List[int]) -> List[FeedRow]:
+    """Get feed rows for the given post ids, in the order the ids were given."""
+    if not post_ids:
+        return []
+    query = select(*FEED_COLUMNS).join(User, Post.author_id == User.id).where(Post.id.in_(post_ids))
+    rows = {row.id: row for row in (FeedRow(*r) for r in await db.execute(query))}
+    return [rows[post_id] for post_id in post_ids if post_id in rows]
@@ -0,0 +1,199 @@
+"""Cross-worker cache invalidation through a small SQLite change log.
+
+Every worker keeps its own caches (feed pages, signed-in users, the
+matching index). A worker that changes data updates its own caches and
+publish()es the change; the others poll the log every
+INVALIDATION_POLL_INTERVAL seconds and apply it too. SQLite hands out row
+ids in commit order, so "rows after the last id seen" is exactly what is
+new. A worker that falls further behind than the retention window finds a
+gap in the ids and has every handler resynchronise from scratch.
+
+SQLite calls can wait on the file lock, so the event loop never makes
+them: publish() only queues rows, and the polling task writes and reads
+the log in a worker thread.
+
+Disabled (publish is a no-op) unless INVALIDATION_LOG names a file, which
+app.launcher sets up for its workers. The log lives on local disk
+regardless of the main database, so it only connects workers on one host.
+"""
+import asyncio
+import inspect
+import logging
+import os
+import sqlite3
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Union
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Called with the published keys, or None to mean "everything" (after a gap)
+Handler = Callable[[Optional[List[str]]], Union[None, Awaitable[None]]]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS invalidations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    pid INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    key TEXT,
+    created REAL NOT NULL
+)
+"""
+
+
+class InvalidationLog:
+    def __init__(self, path: Optional[str], interval: float, retention: float):
+        self.path = path
+        self.interval = interval
+        self.retention = retention
+        self.handlers: Dict[str, List[Handler]] = {}
+        self.conn: Optional[sqlite3.Connection] = None
+        self.task: Optional[asyncio.Task] = None
+        self.pending: List[tuple] = []
+        self.wakeup: Optional[asyncio.Event] = None
+        self.stopping = False
+        self.last_id = 0
+        self.last_prune = 0.0
+        self.published = 0
+        self.applied = 0
+        self.resyncs = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.conn is None:
+            # Autocommit; the log is disposable, so no fsync (a crash loses the caches too)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(SCHEMA)
+            self.conn = conn
+        return self.conn
+
+    def subscribe(self, channel: str, handler: Handler):
+        self.handlers.setdefault(channel, []).append(handler)
+
+    def publish(self, channel: str, keys: Iterable = (None,)):
+        """Tell the other workers about a change this process has already applied.
+
+        Queued for the polling task, which wakes up to write it; without a
+        running task (a CLI process) the rows are written right away.
+        """
+        if not self.enabled:
+            return
+        pid, now = os.getpid(), time.time()
+        self.pending.extend((pid, channel, None if key is None else str(key), now) for key in keys)
+        if self.task is None:
+            rows, self.pending = self.pending, []
+            self._write(rows)
+        else:
+            self.wakeup.set()
+
+    def _write(self, rows: List[tuple]):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany("INSERT INTO invalidations (pid, channel, key, created) VALUES (?, ?, ?, ?)", rows)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self.published += len(rows)
+
+    async def _flush(self):
+        # Taken on the event loop, so publish() never appends to a list being written
+        rows, self.pending = self.pending, []
+        try:
+            await asyncio.to_thread(self._write, rows)
+        except BaseException:
+            self.pending[:0] = rows  # Retried on the next wakeup
+            raise
+
+    def start(self):
+        """Start following the log from its current end; call before loading the caches it keeps fresh"""
+        if not self.enabled:
+            return
+        self.last_id = self._connect().execute("SELECT COALESCE(MAX(id), 0) FROM invalidations").fetchone()[0]
+        self.wakeup = asyncio.Event()
+        self.stopping = False
+        self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Write what's still queued, then stop polling"""
+        if self.task is not None:
+            self.stopping = True
+            self.wakeup.set()
+            await self.task
+            self.task = None
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    async def _run(self):
+        while not self.stopping:
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+            try:
+                if self.pending:
+                    await self._flush()
+                if not self.stopping:
+                    await self.poll()
+            except Exception:
+                logger.exception("Reading or writing the invalidation log failed")
+
+    def _read(self, after_id: int) -> List[tuple]:
+        conn = self._connect()
+        rows = conn.execute(
+            "SELECT id, pid, channel, key FROM invalidations WHERE id > ? ORDER BY id", (after_id,)
+        ).fetchall()
+        if time.monotonic() - self.last_prune > self.retention / 2:
+            self.last_prune = time.monotonic()
+            conn.execute("DELETE FROM invalidations WHERE created < ?", (time.time() - self.retention,))
+        return rows
+
+    async def poll(self):
+        """Apply everything other workers published since the last poll"""
+        rows = await asyncio.to_thread(self._read, self.last_id)
+        if rows:
+            if rows[0][0] > self.last_id + 1:
+                # Rows we never saw were pruned: we can't tell what changed
+                self.resyncs += 1
+                changes: Dict[str, Optional[List[str]]] = {channel: None for channel in self.handlers}
+            else:
+                changes = {}
+                pid = os.getpid()
+                for _, sender, channel, key in rows:
+                    if sender == pid:
+                        continue
+                    if key is None:
+                        changes[channel] = None
+                    elif changes.get(channel, []) is not None:
+                        changes.setdefault(channel, []).append(key)
+            self.last_id = rows[-1][0]
+            for channel, keys in changes.items():
+                for handler in self.handlers.get(channel, ()):
+                    result = handler(keys)
+                    if inspect.isawaitable(result):
+                        await result
+                self.applied += 1
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "last_id": self.last_id,
+            "published": self.published,
+            "queued": len(self.pending),
+            "applied": self.applied,
+            "resyncs": self.resyncs,
+        }
+
+
+invalidation_log = InvalidationLog(
+    settings.invalidation_log, settings.invalidation_poll_interval, settings.invalidation_retention_seconds
+)
@@ -0,0 +1,72 @@
+"""Production server: several uvicorn workers sharing one listening socket.
+
+    python -m app.launcher --workers 4 --port 8000
+
+Before forking, the launcher brings the schema up to date once, so workers
+boot with a version check only. Workers share an invalidation log (see
+app.invalidation) that keeps their caches coherent, and each warms its
+connection pool before it takes requests.
+
+Signals to the launcher process:
+  HUP        rolling restart (e.g. after a deploy): each worker's replacement
+             is started and ready before the old worker is stopped, and old
+             workers finish in-flight requests for up to --graceful-timeout
+  TTIN/TTOU  add / remove a worker
+  TERM/INT   drain and stop
+Workers that die are replaced. The ready-before-stop rolling restart needs
+uvicorn 0.51 or later; older releases stopped each worker first.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+
+
+async def migrate():
+    from app.database.connection import engine, init_db
+
+    await init_db()
+    await engine.dispose()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.launcher", description="Run SkillConnect with N workers")
+    parser.add_argument("--host", default=None, help="bind address (default: HOST setting)")
+    parser.add_argument("--port", type=int, default=None, help="bind port (default: PORT setting)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes (default: one per core)")
+    parser.add_argument("--graceful-timeout", type=float, default=30, help="seconds a stopping worker may drain requests")
+    parser.add_argument("--pool-warm", type=int, default=4, help="DB connections each worker opens at startup")
+    parser.add_argument("--invalidation-log", help="SQLite file for cross-worker cache invalidation (default: a temp file)")
+    parser.add_argument("--proxy-headers", action="store_true", help="trust X-Forwarded-* from --forwarded-allow-ips")
+    parser.add_argument("--forwarded-allow-ips", default="127.0.0.1")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+
+    # Workers are spawned fresh and read their settings from the environment
+    os.environ.setdefault("DB_POOL_WARM", str(args.pool_warm))
+    if args.workers > 1:
+        os.environ["INVALIDATION_LOG"] = (
+            args.invalidation_log
+            or os.environ.get("INVALIDATION_LOG")
+            or os.path.join(tempfile.mkdtemp(prefix="skillconnect-"), "invalidations.db")
+        )
+
+    import uvicorn
+
+    from app.config import settings
+
+    asyncio.run(migrate())
+    uvicorn.run(
+        "main:app",
+        host=args.host or settings.host,
+        port=args.port or settings.port,
+        workers=args.workers,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        proxy_headers=args.proxy_headers,
+        forwarded_allow_ips=args.forwarded_allow_ips,
+        log_level=args.log_level,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Post, post_skills, user_skills
+
+if TYPE_CHECKING:
+    import numpy as np
+    from scipy import sparse
+
+
+@dataclass(frozen=True, slots=True)
+class Match:
+    """A scored candidate: cosine similarity in IDF-weighted skill space, plus shared skill count."""
+    id: int
+    score: float
+    shared_skills: int
+
+
+class SkillMatrix:
+    """Sparse binary entity x skill matrix with append-friendly incremental updates.
+
+    Rows are entities (users or posts), columns are skill ids. New rows are
+    buffered and stacked onto the CSR matrix in one step at the next query;
+    changing an existing row rebuilds the matrix from the in-memory rows
+    without going back to the database. numpy/scipy are only imported once
+    the first query builds the matrix, which keeps them out of startup.
+    """
+
+    def __init__(self):
+        self.ids: List[int] = []
+        self.rows: Dict[int, int] = {}
+        self.skills: Dict[int, List[int]] = {}
+        self.matrix: Optional["sparse.csr_matrix"] = None
+        self.max_skill_id = 0
+        self._pending: List[int] = []
+        self._stale = False
+        self._weights: Optional[Tuple["np.ndarray", "np.ndarray"]] = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def set(self, entity_id: int, skill_ids: Iterable[int]):
+        skill_ids = sorted(set(skill_ids))
+        if skill_ids:
+            self.max_skill_id = max(self.max_skill_id, skill_ids[-1])
+        if entity_id in self.rows:
+            if self.skills[entity_id] != skill_ids:
+                self.skills[entity_id] = skill_ids
+                self._stale = True
+        else:
+            self.rows[entity_id] = len(self.ids)
+            self.ids.append(entity_id)
+            self.skills[entity_id] = skill_ids
+            self._pending.append(entity_id)
+        self._weights = None
+
+    def _build(self, entity_ids: List[int], width: int) -> "sparse.csr_matrix":
+        import numpy as np
+        from scipy import sparse
+
+        indptr = np.zeros(len(entity_ids) + 1, dtype=np.int64)
+        np.cumsum([len(self.skills[i]) for i in entity_ids], out=indptr[1:])
+        indices = np.fromiter(
+            (skill for i in entity_ids for skill in self.skills[i]), dtype=np.int32, count=indptr[-1]
+        )
+        data = np.ones(len(indices), dtype=np.float32)
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(entity_ids), width))
+
+    def refresh(self, width: int) -> "sparse.csr_matrix":
+        """Apply buffered changes and widen to ``width`` skill columns."""
+        from scipy import sparse
+
+        if self.matrix is None:
+            self.matrix = self._build([], 0)
+        width = max(width, self.matrix.shape[1])
+        if self._stale:
+            self.matrix = self._build(self.ids, width)
+            self._stale = False
+            self._pending = []
+        elif self._pending:
+            if self.matrix.shape[1] < width:
+                self.matrix.resize((self.matrix.shape[0], width))
+            self.matrix = sparse.vstack([self.matrix, self._build(self._pending, width)], format="csr")
+            self._pending = []
+        elif self.matrix.shape[1] < width:
+            self.matrix.resize((self.matrix.shape[0], width))
+        return self.matrix
+
+    def weights(self) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Squared IDF weight per skill and weighted norm per row, cached until the next change."""
+        import numpy as np
+
+        if self._weights is None or len(self._weights[0]) != self.matrix.shape[1]:
+            df = np.asarray(self.matrix.sum(axis=0)).ravel()
+            # Rarer skills among the candidates count for more
+            idf = np.log1p(len(self.ids) / (1.0 + df)).astype(np.float32)
+            squared = idf * idf
+            self._weights = (squared, np.sqrt(self.matrix @ squared))
+        return self._weights
+
+
+class MatchingEngine:
+    """In-memory skill matcher between posts' required skills and users' skills.
+
+    Built once from the user_skills / post_skills tables, then kept current by
+    add_user / add_post as rows are written.
+    """
+
+    def __init__(self):
+        self.users = SkillMatrix()
+        self.posts = SkillMatrix()
+        self.post_authors: Dict[int, int] = {}
+        self.posts_by_author: Dict[int, List[int]] = {}
+        self.loaded = False
+
+    async def load(self, db: AsyncSession):
+        """(Re)build both matrices from the database."""
+        users, posts = SkillMatrix(), SkillMatrix()
+        user_rows: Dict[int, List[int]] = {}
+        for user_id, skill_id in await db.execute(select(user_skills.c.user_id, user_skills.c.skill_id)):
+            user_rows.setdefault(user_id, []).append(skill_id)
+        for user_id, skill_ids in user_rows.items():
+            users.set(user_id, skill_ids)
+
+        post_rows: Dict[int, List[int]] = {}
+        for post_id, skill_id in await db.execute(select(post_skills.c.post_id, post_skills.c.skill_id)):
+            post_rows.setdefault(post_id, []).append(skill_id)
+        for post_id, skill_ids in post_rows.items():
+            posts.set(post_id, skill_ids)
+        authors: Dict[int, int] = {}
+        by_author: Dict[int, List[int]] = {}
+        for post_id, author_id in await db.execute(select(Post.id, Post.author_id)):
+            authors[post_id] = author_id
+            by_author.setdefault(author_id, []).append(post_id)
+
+        self.users, self.posts = users, posts
+        self.post_authors, self.posts_by_author = authors, by_author
+        self.loaded = True
+
+    async def load_users(self, db: AsyncSession, user_ids: Iterable[int]):
+        """Re-read some users' skills from the database (e.g. written by another worker)."""
+        user_ids = list(user_ids)
+        rows: Dict[int, List[int]] = {user_id: [] for user_id in user_ids}
+        query = select(user_skills.c.user_id, user_skills.c.skill_id).where(user_skills.c.user_id.in_(user_ids))
+        for user_id, skill_id in await db.execute(query):
+            rows[user_id].append(skill_id)
+        for user_id, skill_ids in rows.items():
+            self.add_user(user_id, skill_ids)
+
+    async def load_posts(self, db: AsyncSession, post_ids: Iterable[int]):
+        """Read some posts into the index (e.g. created by another worker); unknown ids are skipped."""
+        post_ids = list(post_ids)
+        authors = dict((await db.execute(select(Post.id, Post.author_id).where(Post.id.in_(post_ids)))).all())
+        rows: Dict[int, List[int]] = {post_id: [] for post_id in authors}
+        query = select(post_skills.c.post_id, post_skills.c.skill_id).where(post_skills.c.post_id.in_(list(authors)))
+        for post_id, skill_id in await db.execute(query):
+            rows[post_id].append(skill_id)
+        for post_id, skill_ids in rows.items():
+            self.add_post(post_id, authors[post_id], skill_ids)
+
+    def add_user(self, user_id: int, skill_ids: Iterable[int]):
+        self.users.set(user_id, skill_ids)
+
+    def add_post(self, post_id: int, author_id: int, skill_ids: Iterable[int]):
+        if post_id not in self.post_authors:
+            self.posts_by_author.setdefault(author_id, []).append(post_id)
+        self.post_authors[post_id] = author_id
+        self.posts.set(post_id, skill_ids)
+
+    def _refresh(self):
+        # Both sides share one column space so either can be queried against the other
+        width = 1 + max(self.users.max_skill_id, self.posts.max_skill_id)
+        self.users.refresh(width)
+        self.posts.refresh(width)
+
+    @staticmethod
+    def _top_k(candidates: SkillMatrix, skill_ids: List[int], k: int, exclude: Tuple[int, ...]) -> List[Match]:
+        import numpy as np
+
+        matrix = candidates.matrix
+        if not skill_ids or not len(candidates):
+            return []
+        weights, candidate_norms = candidates.weights()
+        query = np.zeros(matrix.shape[1], dtype=np.float32)
+        query[skill_ids] = 1.0
+
+        dot = matrix @ (query * weights)
+        query_norm = np.sqrt(weights[skill_ids].sum())
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = np.where(candidate_norms > 0, dot / (candidate_norms * query_norm), 0.0)
+        for entity_id in exclude:
+            row = candidates.rows.get(entity_id)
+            if row is not None:
+                scores[row] = 0.0
+
+        hits = np.flatnonzero(scores > 0)
+        if len(hits) > k:
+            hits = hits[np.argpartition(scores[hits], -k)[-k:]]
+        hits = hits[np.argsort(-scores[hits], kind="stable")]
+        shared = matrix[hits] @ query
+        return [
+            Match(candidates.ids[row], float(scores[row]), int(count))
+            for row, count in zip(hits, shared)
+        ]
+
+    def collaborators_for_post(self, post_id: int, k: int = 10) -> List[Match]:
+        """Top-k users whose skills best cover a post's required skills (author excluded)."""
+        self._refresh()
+        skill_ids = self.posts.skills.get(post_id, [])
+        return self._top_k(self.users, skill_ids, k, (self.post_authors.get(post_id),))
+
+    def posts_for_user(self, user_id: int, k: int = 10) -> List[Match]:
+        """Top-k posts whose required skills best match a user's skills (own posts excluded)."""
+        self._refresh()
+        skill_ids = self.users.skills.get(user_id, [])
+        own = tuple(self.posts_by_author.get(user_id, ()))
+        return self._top_k(self.posts, skill_ids, k, own)
+
+
+matching_engine = MatchingEngine()
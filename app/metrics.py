@@ -0,0 +1,255 @@
+import asyncio
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+
+from app.config import settings
+
+# Request latency buckets (seconds), Prometheus client defaults
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+# SQL statements are much faster than whole requests
+SQL_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    parts = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()):
+        super().__init__(name, help, labels)
+        self.values: Dict[Tuple, float] = {}
+
+    def inc(self, *label_values, amount: float = 1):
+        self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def render(self) -> List[str]:
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in sorted(self.values.items())
+        ]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (+Inf last), sum]
+        self.series: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, *label_values):
+        series = self.series.get(label_values)
+        if series is None:
+            series = self.series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for key, (counts, total) in sorted(self.series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(float(bound))}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+class Gauge(Metric):
+    """Value read from a callback at scrape time, returning {label values: value}
+
+    ``kind="counter"`` exposes a monotonically increasing value kept elsewhere.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, collect: Callable[[], Dict[Tuple, float]], labels: Iterable[str] = (),
+                 kind: str = "gauge"):
+        super().__init__(name, help, labels)
+        self.collect = collect
+        self.kind = kind
+
+    def render(self) -> List[str]:
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in sorted(self.collect().items())
+        ]
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[Metric] = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.register(Counter(
+    "skillconnect_http_requests_total", "HTTP requests by route and status", ("method", "route", "status")))
+http_duration = registry.register(Histogram(
+    "skillconnect_http_request_duration_seconds", "HTTP request latency by route", ("method", "route")))
+http_sql_statements = registry.register(Histogram(
+    "skillconnect_http_request_sql_statements", "SQL statements executed per HTTP request", ("method", "route"),
+    buckets=COUNT_BUCKETS))
+sql_duration = registry.register(Histogram(
+    "skillconnect_sql_statement_duration_seconds", "SQL statement execution time", ("engine",), buckets=SQL_BUCKETS))
+password_work = registry.register(Histogram(
+    "skillconnect_password_work_seconds", "bcrypt time inside the password worker pool", ("operation",)))
+password_queue = registry.register(Histogram(
+    "skillconnect_password_queue_seconds", "Wait for a password worker before bcrypt starts", ("operation",)))
+authentications = registry.register(Histogram(
+    "skillconnect_authenticate_seconds", "authenticate_user latency by outcome", ("result",)))
+admission_rejections = registry.register(Counter(
+    "skillconnect_admission_rejected_total", "Requests refused by admission control", ("route", "reason")))
+loop_lag = registry.register(Histogram(
+    "skillconnect_event_loop_lag_seconds", "How late the event loop ran a timer callback", buckets=SQL_BUCKETS + (2.5, 5.0, 10.0)))
+
+# SQL statements run by the request being served (a one-item list, so nested tasks share it)
+_request_statements: ContextVar[Optional[list]] = ContextVar("request_statements", default=None)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status and SQL statement count per route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = [500]
+        statements = [0]
+        token = _request_statements.set(statements)
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            _request_statements.reset(token)
+            route = scope.get("route")
+            # Label by path template, never the raw path, to keep series bounded
+            path = getattr(route, "path", None)
+            if path is None:
+                # Mounted apps (e.g. /static) only leave their prefix in root_path
+                path = scope.get("root_path", "")[len(scope.get("app_root_path", "")):] or "<unmatched>"
+            method = scope["method"]
+            http_requests.inc(method, path, status[0])
+            http_duration.observe(elapsed, method, path)
+            http_sql_statements.observe(statements[0], method, path)
+
+
+def instrument_engine(engine, name: str):
+    """Time every SQL statement on an (async) engine and count it against the current request"""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_start", []).append(time.perf_counter())
+        statements = _request_statements.get()
+        if statements is not None:
+            statements[0] += 1
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("metrics_start")
+        if started:
+            sql_duration.observe(time.perf_counter() - started.pop(), name)
+
+
+def register_pools(engines: Dict[str, object], stats):
+    """Expose connection pool usage per engine and the shared checkout wait totals"""
+    pools = {name: engine.sync_engine.pool for name, engine in engines.items()}
+    pools = {name: pool for name, pool in pools.items() if hasattr(pool, "checkedout")}
+
+    def connections():
+        values = {}
+        for name, pool in pools.items():
+            values[(name, "checked_out")] = pool.checkedout()
+            values[(name, "idle")] = pool.checkedin()
+            values[(name, "overflow")] = max(pool.overflow(), 0)
+        return values
+
+    registry.register(Gauge(
+        "skillconnect_db_pool_connections", "Pooled connections by engine and state", connections, ("engine", "state")))
+    registry.register(Gauge(
+        "skillconnect_db_pool_checkouts_total", "Connection checkouts", lambda: {(): stats.checkouts}, kind="counter"))
+    registry.register(Gauge(
+        "skillconnect_db_pool_checkout_wait_seconds_total", "Time spent waiting for a pooled connection",
+        lambda: {(): stats.total_wait}, kind="counter"))
+    registry.register(Gauge(
+        "skillconnect_db_pool_checkout_wait_max_seconds", "Longest wait for a pooled connection",
+        lambda: {(): stats.max_wait}))
+
+
+def register_cache(name: str, cache):
+    """Expose a cache's stats() counters (hits, misses, size...)"""
+    def collect():
+        return {(name, key): value for key, value in cache.stats().items()}
+
+    registry.register(Gauge(f"skillconnect_cache_{name}", f"{name} cache statistics", collect, ("cache", "stat")))
+
+
+async def monitor_event_loop(interval: float):
+    """Record how far past its deadline each sleep wakes up; runs until cancelled"""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        loop_lag.observe(max(0.0, loop.time() - start - interval))
+
+
+def start_event_loop_monitor() -> Optional[asyncio.Task]:
+    if settings.event_loop_lag_interval <= 0:
+        return None
+    return asyncio.get_running_loop().create_task(monitor_event_loop(settings.event_loop_lag_interval))
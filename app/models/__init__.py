@@ -1,8 +1,52 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index, Table
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database.connection import Base
 
+# SQLite keeps CURRENT_TIMESTAMP as "YYYY-MM-DD HH:MM:SS" text. Bind datetimes in the
+# same format so keyset comparisons on created_at line up with the stored values.
+Timestamp = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"),
+    "sqlite",
+)
+
+
+# Skill associations. The (skill_id, ...) indexes serve "who/what has skill X" lookups;
+# the primary keys serve "skills of user/post Y".
+user_skills = Table(
+    "user_skills",
+    Base.metadata,
+    Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    Column("skill_id", Integer, ForeignKey("skills.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_user_skills_skill_id_user_id", "skill_id", "user_id"),
+)
+
+post_skills = Table(
+    "post_skills",
+    Base.metadata,
+    Column("post_id", Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True),
+    Column("skill_id", Integer, ForeignKey("skills.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_post_skills_skill_id_post_id", "skill_id", "post_id"),
+)
+
+# Materialized "ideas matching my skills" timelines, filled by fan-out on write
+# (app.timeline). The primary key is the read path: one user's entries, newest first.
+timeline_entries = Table(
+    "timeline_entries",
+    Base.metadata,
+    Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    Column("created_at", Timestamp, primary_key=True),
+    Column("post_id", Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True),
+)
+
+
+class Skill(Base):
+    __tablename__ = "skills"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), unique=True, index=True, nullable=False)  # Canonical form, see app.skills
+
 
 class User(Base):
     __tablename__ = "users"
@@ -12,10 +56,10 @@ class User(Base):
     phone = Column(String(20), unique=True, index=True, nullable=True)
     password_hash = Column(String(255), nullable=False)
     full_name = Column(String(255), nullable=True)
-    skills = Column(Text, nullable=True)  # Comma-separated skills
+    skills = Column(Text, nullable=True)  # Comma-separated skills as entered (indexed copy in user_skills)
     bio = Column(Text, nullable=True)
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
 
     # Relationships
     posts = relationship("Post", back_populates="author", cascade="all, delete-orphan")
@@ -27,9 +71,15 @@ class Post(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=False)
-    required_skills = Column(Text, nullable=True)  # Comma-separated skills needed
+    required_skills = Column(Text, nullable=True)  # Comma-separated skills needed (indexed copy in post_skills)
     author_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
 
     # Relationships
-    author = relationship("User", back_populates="posts")
\ No newline at end of file
+    author = relationship("User", back_populates="posts")
+
+    # Keyset pagination indexes for the home feed and per-author post lists
+    __table_args__ = (
+        Index("ix_posts_created_at_id", "created_at", "id"),
+        Index("ix_posts_author_created_at_id", "author_id", "created_at", "id"),
+    )
\ No newline at end of file
@@ -0,0 +1,178 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import feed_cache
+from app.config import settings
+from app.database.connection import engine
+from app.invalidation import invalidation_log
+from app.matching import matching_engine
+from app.models import Post, post_skills
+from app.skills import link_skills, set_post_skills
+from app.timeline import timeline_fanout
+
+logger = logging.getLogger(__name__)
+
+# PRAGMA synchronous (SQLite) / synchronous_commit (Postgres) per POST_COMMIT_DURABILITY
+# "full" syncs every group commit to disk; "relaxed" may lose the last commits on
+# power failure. On SQLite that is only corruption-safe in WAL mode
+# (SQLITE_JOURNAL_MODE=wal): with a rollback journal, NORMAL can corrupt the file.
+SQLITE_SYNCHRONOUS = {"full": "FULL", "relaxed": "NORMAL"}
+POSTGRES_SYNCHRONOUS_COMMIT = {"full": "on", "relaxed": "off"}
+
+
+def after_posts_created(posts):
+    """Update in-memory indexes once new posts are committed: (post_id, author_id, skill_ids) tuples"""
+    for post_id, author_id, skill_ids in posts:
+        matching_engine.add_post(post_id, author_id, skill_ids)
+    feed_cache.invalidate()
+    post_ids = [post_id for post_id, _, _ in posts]
+    timeline_fanout.enqueue_posts(post_ids)
+    invalidation_log.publish("posts", post_ids)
+
+
+async def create_post(db: AsyncSession, author_id: int, title: str, description: str,
+                      required_skills: Optional[str]) -> int:
+    """Insert one post in its own transaction; returns the new post id"""
+    new_post = Post(title=title, description=description, required_skills=required_skills, author_id=author_id)
+    db.add(new_post)
+    await db.flush()
+    skill_ids = await db.run_sync(set_post_skills, new_post.id, required_skills)
+    await db.commit()
+    after_posts_created([(new_post.id, author_id, skill_ids)])
+    return new_post.id
+
+
+@dataclass
+class PendingPost:
+    values: dict
+    future: asyncio.Future = field(repr=False)
+
+
+class PostWriteQueue:
+    """Group commit for new posts.
+
+    Callers ``await submit(...)`` and get their post id once the transaction
+    holding it has committed (or the exception that stopped it). A single
+    writer task drains the queue, inserting up to ``batch_size`` posts per
+    transaction and waiting at most ``window`` seconds for a batch to fill.
+    """
+
+    def __init__(self, batch_size: int, window: float, durability: str = "default"):
+        self.batch_size = batch_size
+        self.window = window
+        self.durability = durability
+        self.queue: Optional[asyncio.Queue] = None
+        self.task: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.posts = 0
+
+    def start(self):
+        self.queue = asyncio.Queue()
+        self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Flush what's queued, then stop the writer"""
+        if self.task is None:
+            return
+        await self.queue.put(None)
+        await self.task
+        self.task = None
+
+    async def submit(self, author_id: int, title: str, description: str, required_skills: Optional[str]) -> int:
+        if self.task is None:
+            raise RuntimeError("Post write queue is not running")
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put(PendingPost(
+            {"title": title, "description": description, "required_skills": required_skills, "author_id": author_id},
+            future,
+        ))
+        return await future
+
+    async def _run(self):
+        stopping = False
+        while not stopping:
+            first = await self.queue.get()
+            if first is None:
+                break
+            batch = [first]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.batch_size:
+                try:
+                    item = self.queue.get_nowait() if deadline <= time.monotonic() else await asyncio.wait_for(
+                        self.queue.get(), deadline - time.monotonic())
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[PendingPost]):
+        try:
+            created = await self._insert(batch)
+        except Exception:
+            if len(batch) == 1:
+                logger.exception("Post insert failed")
+                if not batch[0].future.done():
+                    batch[0].future.set_exception(RuntimeError("Could not save post"))
+                return
+            # One bad row shouldn't fail everyone: retry each post on its own
+            for pending in batch:
+                await self._flush([pending])
+            return
+        self.batches += 1
+        self.posts += len(batch)
+        try:
+            after_posts_created(created)
+        except Exception:
+            # The posts are committed; a stale index must not fail their requests
+            logger.exception("Updating indexes after post insert failed")
+        for pending, (post_id, _, _) in zip(batch, created):
+            if not pending.future.done():
+                pending.future.set_result(post_id)
+
+    async def _insert(self, batch: List[PendingPost]):
+        values = [pending.values for pending in batch]
+        async with engine.connect() as conn:
+            dialect = conn.dialect.name
+            previous_synchronous = None
+            if dialect == "sqlite" and self.durability in SQLITE_SYNCHRONOUS:
+                previous_synchronous = (await conn.exec_driver_sql("PRAGMA synchronous")).scalar()
+                await conn.exec_driver_sql(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS[self.durability]}")
+                await conn.commit()
+            try:
+                async with conn.begin():
+                    if dialect == "postgresql" and self.durability in POSTGRES_SYNCHRONOUS_COMMIT:
+                        await conn.exec_driver_sql(
+                            f"SET LOCAL synchronous_commit TO {POSTGRES_SYNCHRONOUS_COMMIT[self.durability]}")
+                    result = await conn.execute(insert(Post).returning(Post.id, sort_by_parameter_order=True), values)
+                    post_ids = result.scalars().all()
+                    skill_ids = await conn.run_sync(link_skills, post_skills, "post_id", {
+                        post_id: value["required_skills"] for post_id, value in zip(post_ids, values)
+                    })
+            finally:
+                if previous_synchronous is not None:
+                    # Pooled connection: put back whatever it had (0-3), not an assumed profile value
+                    await conn.exec_driver_sql(f"PRAGMA synchronous={int(previous_synchronous)}")
+                    await conn.commit()
+        return [(post_id, value["author_id"], skill_ids[post_id]) for post_id, value in zip(post_ids, values)]
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "posts": self.posts,
+            "avg_batch": round(self.posts / self.batches, 2) if self.batches else 0.0,
+            "queued": self.queue.qsize() if self.queue else 0,
+        }
+
+
+post_writer = PostWriteQueue(
+    settings.post_batch_size, settings.post_batch_window_ms / 1000, settings.post_commit_durability
+)
@@ -0,0 +1,121 @@
+from functools import lru_cache
+from html import escape as _escape
+from typing import AsyncIterable, AsyncIterator, Iterable, Optional
+from urllib.parse import quote
+
+from app.skills import canonicalize_skill
+
+NAV_LINK = '<a href="{href}" style="color: white; text-decoration: none;">{label}</a>'
+
+
+def _nav(links) -> str:
+    return (
+        '<nav style="background: #2563eb; color: white; padding: 1rem;">'
+        '<div style="max-width: 1200px; margin: 0 auto; display: flex; justify-content: space-between; align-items: center; flex-wrap: wrap;">'
+        '<div style="display: flex; flex-direction: column; line-height: 1.2; margin-bottom: 0.5rem;">'
+        '<a href="/" style="color: white; text-decoration: none; font-size: 1.5rem; font-weight: bold;">SkillConnect</a>'
+        '<span style="font-size: 1.2rem; font-weight: normal;">for yatris of 2025</span>'
+        '</div>'
+        '<div style="display: flex; flex-wrap: wrap; justify-content: center; gap: 0.5rem;">'
+        + "".join(NAV_LINK.format(href=href, label=label) for href, label in links)
+        + "</div></div></nav>"
+    )
+
+
+# Static page shell, assembled once at import. A page is these pieces joined
+# around the escaped title and the page content.
+SHELL_START = '<!DOCTYPE html><html><head><title>'
+SHELL_HEAD_TEMPLATE = (
+    ' - SkillConnect</title><meta charset="utf-8">'
+    '<meta name="viewport" content="width=device-width, initial-scale=1">'
+    '<link rel="stylesheet" href="{stylesheet}"></head><body>'
+)
+SHELL_HEAD = SHELL_HEAD_TEMPLATE.format(stylesheet="/static/css/app.css")
+NAV_ANONYMOUS = _nav([("/", "Home"), ("/search", "Search"), ("/login", "Login"), ("/register", "Register")])
+NAV_SIGNED_IN = _nav([("/", "Home"), ("/search", "Search"), ("/profile", "Profile"), ("/logout", "Logout")])
+CONTAINER_START = '<div class="container">'
+SHELL_END = "</div></body></html>"
+
+
+def use_stylesheet(url: str):
+    """Point the page shell at a (fingerprinted) stylesheet URL"""
+    global SHELL_HEAD
+    SHELL_HEAD = SHELL_HEAD_TEMPLATE.format(stylesheet=escape(url))
+
+
+def escape(value) -> str:
+    """HTML-escape a value for element text or a quoted attribute; None renders as ''."""
+    return "" if value is None else _escape(str(value), quote=True)
+
+
+def page_start(title: str, user=None) -> str:
+    return "".join((SHELL_START, escape(title), SHELL_HEAD, NAV_SIGNED_IN if user else NAV_ANONYMOUS, CONTAINER_START))
+
+
+def render_html(title: str, content: str, user=None) -> str:
+    """Wrap page content (already-safe HTML) in the site shell"""
+    return "".join((page_start(title, user), content, SHELL_END))
+
+
+async def stream_html(title: str, chunks: AsyncIterable[str], user=None) -> AsyncIterator[str]:
+    """Stream the site shell around content chunks as they are produced"""
+    yield page_start(title, user)
+    async for chunk in chunks:
+        yield chunk
+    yield SHELL_END
+
+
+@lru_cache(maxsize=4096)
+def render_skills(text: Optional[str], link: bool = True) -> str:
+    """Render a comma-separated skills string as chips, linked to their filter pages
+
+    Cached: the same few skill lists repeat across most posts.
+    """
+    if not text:
+        return ""
+    parts = []
+    for skill in text.split(","):
+        skill = skill.strip()
+        if not skill:
+            continue
+        if link:
+            parts.append(f'<a href="/posts?skill={quote(canonicalize_skill(skill))}" class="skills">{escape(skill)}</a>')
+        else:
+            parts.append(f'<span class="skills">{escape(skill)}</span>')
+    return "".join(parts)
+
+
+def render_post(post, show_author: bool = True) -> str:
+    """Render one feed row as a post card"""
+    posted_by = f"Posted by {_escape(post.author_username)} • " if show_author else ""
+    return (
+        f'<div class="post"><h3><a href="/posts/{post.id}" style="color: inherit; text-decoration: none;">'
+        f"{_escape(post.title)}</a></h3><p>{_escape(post.description)}</p>"
+        f"<div>{render_skills(post.required_skills)}</div>"
+        f'<div class="post-meta">{posted_by}{post.created_at.date().isoformat()}</div></div>'
+    )
+
+
+def render_posts(posts: Iterable, show_author: bool = True) -> str:
+    """Render feed rows as post cards"""
+    return "".join([render_post(post, show_author) for post in posts])
+
+
+def render_search_result(result) -> str:
+    """Render one search hit; its snippet is already escaped, with <mark> highlights"""
+    return (
+        f'<div class="post"><h3><a href="/posts/{result.id}" style="color: inherit; text-decoration: none;">'
+        f"{_escape(result.title)}</a></h3><p>{result.snippet}</p>"
+        f'<div class="post-meta">Posted by {_escape(result.author_username)} • '
+        f"{result.created_at.date().isoformat()}</div></div>"
+    )
+
+
+def render_collaborator(match, candidate) -> str:
+    """Render a user matched to a post, with how many of its skills they share"""
+    plural = "s" if match.shared_skills != 1 else ""
+    return (
+        f'<div class="post"><h3>{_escape(candidate.full_name or candidate.username)}</h3>'
+        f"<div>{render_skills(candidate.skills, link=False)}</div>"
+        f'<div class="post-meta">@{_escape(candidate.username)} • {match.shared_skills} matching skill{plural}</div></div>'
+    )
@@ -0,0 +1,149 @@
+import html
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Integer, column, func, literal_column, or_, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import Post, User
+
+# Snippet highlight markers; swapped for <mark> tags after the text is escaped
+MARK_START, MARK_END = "\x02", "\x03"
+
+posts_fts = table("posts_fts", column("rowid", Integer))
+
+SQLITE_FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+        title, description, content='posts', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS posts_fts_ai AFTER INSERT ON posts BEGIN
+        INSERT INTO posts_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS posts_fts_ad AFTER DELETE ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS posts_fts_au AFTER UPDATE OF title, description ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO posts_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+]
+
+POSTGRES_FTS_DDL = [
+    """ALTER TABLE posts ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_posts_search_vector ON posts USING GIN (search_vector)",
+]
+
+
+@dataclass(frozen=True, slots=True)
+class SearchRow:
+    """Read-only search hit; ``snippet`` is already HTML-escaped and highlighted."""
+    id: int
+    title: str
+    snippet: str
+    required_skills: Optional[str]
+    created_at: datetime
+    author_username: str
+
+
+def install_search_index(conn):
+    """Create the full-text index over posts and keep it maintained by the database.
+
+    SQLite gets an external-content FTS5 table kept in sync by triggers; Postgres
+    gets a generated tsvector column with a GIN index. Safe to run repeatedly.
+    """
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        exists = conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'posts_fts'")).first()
+        for statement in SQLITE_FTS_DDL:
+            conn.execute(text(statement))
+        if not exists:
+            # Index posts written before the FTS table existed
+            conn.execute(text("INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')"))
+    elif dialect == "postgresql":
+        for statement in POSTGRES_FTS_DDL:
+            conn.execute(text(statement))
+
+
+def fts5_query(terms: str) -> str:
+    """Turn free text into a safe FTS5 query: every word quoted, all words required."""
+    return " ".join('"' + word.replace('"', '""') + '"' for word in terms.split())
+
+
+def highlight(snippet: Optional[str]) -> str:
+    escaped = html.escape(snippet or "")
+    return escaped.replace(MARK_START, "<mark>").replace(MARK_END, "</mark>")
+
+
+async def search_posts(db: AsyncSession, terms: str, page: int = 1) -> Tuple[List[SearchRow], bool]:
+    """Get one page of posts ranked by relevance to ``terms``, and whether more pages exist.
+
+    Pages past SEARCH_MAX_PAGE are served as the last page, which never
+    reports more pages after it.
+    """
+    per_page = settings.feed_page_size
+    page = max(1, min(page, settings.search_max_page))
+    columns = (Post.id, Post.title)
+    trailing = (Post.required_skills, Post.created_at, User.username)
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "sqlite":
+        match = text("posts_fts MATCH :match").bindparams(match=fts5_query(terms))
+        # bm25 has to score every match before it can sort, which gets slow for very
+        # common terms. Rank only the newest search_rank_window matches: the FTS
+        # rowid-range scan for them is cheap and recent ideas are what people want.
+        window = (
+            select(posts_fts.c.rowid)
+            .where(match)
+            .order_by(posts_fts.c.rowid.desc())
+            .limit(settings.search_rank_window)
+            .subquery()
+        )
+        query = (
+            select(
+                *columns,
+                func.snippet(literal_column("posts_fts"), 1, MARK_START, MARK_END, "…", 24),
+                *trailing,
+            )
+            .select_from(posts_fts)
+            .join(Post, Post.id == posts_fts.c.rowid)
+            .where(match, posts_fts.c.rowid >= select(func.min(window.c.rowid)).scalar_subquery())
+            # Title matches weigh more than description matches
+            .order_by(func.bm25(literal_column("posts_fts"), 10.0, 1.0))
+        )
+    elif dialect == "postgresql":
+        ts_query = func.websearch_to_tsquery("english", terms)
+        search_vector = literal_column("posts.search_vector")
+        query = (
+            select(
+                *columns,
+                func.ts_headline(
+                    "english", Post.description, ts_query,
+                    f"StartSel={MARK_START}, StopSel={MARK_END}, MaxWords=24, MinWords=8",
+                ),
+                *trailing,
+            )
+            .where(search_vector.op("@@")(ts_query))
+            .order_by(func.ts_rank_cd(search_vector, ts_query).desc())
+        )
+    else:
+        pattern = f"%{terms}%"
+        query = (
+            select(*columns, Post.description, *trailing)
+            .where(or_(Post.title.ilike(pattern), Post.description.ilike(pattern)))
+            .order_by(Post.created_at.desc())
+        )
+
+    query = query.join(User, User.id == Post.author_id).offset((page - 1) * per_page).limit(per_page + 1)
+    rows = (await db.execute(query)).all()
+    results = [
+        SearchRow(post_id, title, highlight(snippet), required_skills, created_at, username)
+        for post_id, title, snippet, required_skills, created_at, username in rows[:per_page]
+    ]
+    return results, len(rows) > per_page and page < settings.search_max_page
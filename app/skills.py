@@ -0,0 +1,88 @@
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.models import Skill, post_skills, user_skills
+
+MAX_SKILL_LENGTH = 100
+
+
+def canonicalize_skill(name: str) -> str:
+    """Normalize a skill name: trimmed, single-spaced, lowercase."""
+    return " ".join(name.split()).lower()[:MAX_SKILL_LENGTH]
+
+
+def parse_skills(text: Optional[str]) -> List[str]:
+    """Split a comma-separated skills string into unique canonical names, keeping order."""
+    if not text:
+        return []
+    names = (canonicalize_skill(part) for part in text.split(","))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+def _dialect_name(conn) -> str:
+    dialect = getattr(conn, "dialect", None) or conn.get_bind().dialect
+    return dialect.name
+
+
+def get_or_create_skill_ids(conn, names: Iterable[str]) -> Dict[str, int]:
+    """Map canonical skill names to ids, creating any that don't exist yet.
+
+    Works with a sync Session or Connection; from async code use
+    ``await db.run_sync(get_or_create_skill_ids, names)``.
+    """
+    names = list(dict.fromkeys(names))
+    if not names:
+        return {}
+    dialect = _dialect_name(conn)
+    if dialect in ("sqlite", "postgresql"):
+        dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        conn.execute(
+            dialect_insert(Skill.__table__).on_conflict_do_nothing(index_elements=["name"]),
+            [{"name": name} for name in names],
+        )
+        rows = conn.execute(select(Skill.name, Skill.id).where(Skill.name.in_(names)))
+        return dict(rows.all())
+
+    existing = dict(conn.execute(select(Skill.name, Skill.id).where(Skill.name.in_(names))).all())
+    missing = [name for name in names if name not in existing]
+    if missing:
+        conn.execute(insert(Skill.__table__), [{"name": name} for name in missing])
+        existing.update(conn.execute(select(Skill.name, Skill.id).where(Skill.name.in_(missing))).all())
+    return existing
+
+
+def _replace_links(conn, table, owner_column: str, owner_id: int, text: Optional[str]) -> List[int]:
+    conn.execute(delete(table).where(table.c[owner_column] == owner_id))
+    skill_ids = list(get_or_create_skill_ids(conn, parse_skills(text)).values())
+    if skill_ids:
+        conn.execute(
+            insert(table),
+            [{owner_column: owner_id, "skill_id": skill_id} for skill_id in skill_ids],
+        )
+    return skill_ids
+
+
+def link_skills(conn, table, owner_column: str, owners: Dict[int, Optional[str]]) -> Dict[int, List[int]]:
+    """Index the skills of many new users/posts at once: one skills upsert, one link insert.
+
+    ``owners`` maps user/post id to its skills text; returns id -> skill ids.
+    """
+    parsed = {owner_id: parse_skills(text) for owner_id, text in owners.items()}
+    skill_ids = get_or_create_skill_ids(conn, [name for names in parsed.values() for name in names])
+    linked = {owner_id: [skill_ids[name] for name in names] for owner_id, names in parsed.items()}
+    rows = [{owner_column: owner_id, "skill_id": skill_id} for owner_id, ids in linked.items() for skill_id in ids]
+    if rows:
+        conn.execute(insert(table), rows)
+    return linked
+
+
+def set_user_skills(conn, user_id: int, text: Optional[str]) -> List[int]:
+    """Replace a user's indexed skills with those parsed from ``text``; returns the skill ids."""
+    return _replace_links(conn, user_skills, "user_id", user_id, text)
+
+
+def set_post_skills(conn, post_id: int, text: Optional[str]) -> List[int]:
+    """Replace a post's indexed required skills with those parsed from ``text``; returns the skill ids."""
+    return _replace_links(conn, post_skills, "post_id", post_id, text)
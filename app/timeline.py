@@ -0,0 +1,275 @@
+"""Per-user "ideas matching my skills" timelines, materialized by fan-out on write.
+
+Once a post commits it is queued here, and a background task writes a
+timeline_entries row for every user sharing one of its required skills.
+Each post reaches at most TIMELINE_FANOUT_CAP users (those sharing the most
+skills first), so a post tagged with a skill half the site lists costs a
+bounded number of rows. New users get their latest matching posts copied
+in the same way. The logged-in home page then reads a timeline with one
+range scan on the primary key instead of matching skills per view.
+
+Each timeline keeps its TIMELINE_MAX_ENTRIES newest entries: the fan-out
+transaction that writes to a timeline also drops what falls past that, so
+the table grows with the number of users rather than users times posts.
+
+Fill the timelines of an existing database with
+
+    python -m app.timeline backfill
+"""
+import argparse
+import asyncio
+import logging
+import time
+from typing import List, Optional, Tuple
+
+from sqlalchemy import bindparam, delete, func, literal, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database.connection import engine, init_db
+from app.feed import FEED_COLUMNS, FeedRow, decode_cursor, encode_cursor
+from app.models import Post, User, post_skills, timeline_entries, user_skills
+
+logger = logging.getLogger(__name__)
+
+TIMELINE_COLUMNS = ["user_id", "created_at", "post_id"]
+# Timelines probed per query when pruning, to keep its IN list well under parameter limits
+PRUNE_CHUNK = 500
+
+
+def insert_ignoring_duplicates(dialect: str):
+    """INSERT into timeline_entries that skips rows already there (fan-out and backfill overlap)"""
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(timeline_entries).on_conflict_do_nothing()
+
+
+def post_recipients(post_id: int, cap: int):
+    """(user_id, created_at, post_id) for the users a post fans out to"""
+    shared = func.count()
+    return (
+        select(user_skills.c.user_id, Post.created_at, Post.id)
+        .select_from(post_skills)
+        .join(user_skills, user_skills.c.skill_id == post_skills.c.skill_id)
+        .join(Post, Post.id == post_skills.c.post_id)
+        .where(post_skills.c.post_id == post_id, user_skills.c.user_id != Post.author_id)
+        .group_by(user_skills.c.user_id, Post.created_at, Post.id)
+        .order_by(shared.desc(), user_skills.c.user_id.desc())
+        .limit(cap)
+    )
+
+
+def user_matches(user_id: int, limit: int):
+    """(user_id, created_at, post_id) for a user's newest matching posts by others"""
+    return (
+        select(literal(user_id), Post.created_at, Post.id)
+        .select_from(user_skills)
+        .join(post_skills, post_skills.c.skill_id == user_skills.c.skill_id)
+        .join(Post, Post.id == post_skills.c.post_id)
+        .where(user_skills.c.user_id == user_id, Post.author_id != user_id)
+        .distinct()
+        .order_by(Post.created_at.desc(), Post.id.desc())
+        .limit(limit)
+    )
+
+
+def timeline_cutoffs(user_ids: List[int], keep: int):
+    """(user_id, created_at, post_id) of the newest entry past ``keep`` in each timeline (NULLs if none)"""
+    past = (
+        select(timeline_entries.c.created_at)
+        .where(timeline_entries.c.user_id == User.id)
+        .order_by(timeline_entries.c.created_at.desc(), timeline_entries.c.post_id.desc())
+        .offset(keep)
+        .limit(1)
+    )
+    return select(
+        User.id,
+        past.scalar_subquery(),
+        past.with_only_columns(timeline_entries.c.post_id).scalar_subquery(),
+    ).where(User.id.in_(user_ids))
+
+
+async def prune(conn, user_ids: List[int], keep: int) -> int:
+    """Drop all but the ``keep`` newest entries of these timelines; returns the timelines trimmed.
+
+    One index probe per timeline finds its cutoff, so timelines under the
+    limit cost no more than that; only those over it get a DELETE.
+    """
+    trimmed = 0
+    trim = delete(timeline_entries).where(
+        timeline_entries.c.user_id == bindparam("b_user_id"),
+        tuple_(timeline_entries.c.created_at, timeline_entries.c.post_id)
+        <= tuple_(bindparam("b_created_at", type_=timeline_entries.c.created_at.type), bindparam("b_post_id")),
+    )
+    for start in range(0, len(user_ids), PRUNE_CHUNK):
+        over = [
+            {"b_user_id": user_id, "b_created_at": created_at, "b_post_id": post_id}
+            for user_id, created_at, post_id in await conn.execute(
+                timeline_cutoffs(user_ids[start:start + PRUNE_CHUNK], keep))
+            if post_id is not None
+        ]
+        if over:
+            await conn.execute(trim, over)
+            trimmed += len(over)
+    return trimmed
+
+
+async def fan_out(conn, post_ids: List[int] = (), user_ids: List[int] = ()) -> int:
+    """Write timeline rows for new posts and new users; returns the rows written"""
+    written, grown = 0, set()
+    insert = insert_ignoring_duplicates(conn.dialect.name)
+    selects = [post_recipients(post_id, settings.timeline_fanout_cap) for post_id in post_ids]
+    selects += [user_matches(user_id, settings.timeline_backfill_per_user) for user_id in user_ids]
+    for rows in selects:
+        result = await conn.execute(insert.from_select(TIMELINE_COLUMNS, rows).returning(timeline_entries.c.user_id))
+        recipients = result.scalars().all()
+        written += len(recipients)
+        grown.update(recipients)
+    # Only the timelines that just grew can be over the limit
+    if settings.timeline_max_entries > 0 and grown:
+        await prune(conn, sorted(grown), settings.timeline_max_entries)
+    return written
+
+
+class TimelineFanout:
+    """Background writer for timeline fan-out.
+
+    enqueue_* only queue ids; one task drains up to ``batch_size`` of them per
+    transaction, so posting never waits on fan-out. Entries queued while the
+    task isn't running (e.g. timelines disabled) are dropped; a backfill
+    recovers them.
+    """
+
+    def __init__(self, batch_size: int):
+        self.batch_size = batch_size
+        self.queue: Optional[asyncio.Queue] = None
+        self.task: Optional[asyncio.Task] = None
+        self.posts = 0
+        self.users = 0
+        self.rows = 0
+        self.failures = 0
+
+    def start(self):
+        self.queue = asyncio.Queue()
+        self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Finish what's queued, then stop"""
+        if self.task is None:
+            return
+        await self.queue.put(None)
+        await self.task
+        self.task = None
+
+    def enqueue_posts(self, post_ids: List[int]):
+        if self.task is not None:
+            for post_id in post_ids:
+                self.queue.put_nowait(("post", post_id))
+
+    def enqueue_user(self, user_id: int):
+        if self.task is not None:
+            self.queue.put_nowait(("user", user_id))
+
+    async def _run(self):
+        stopping = False
+        while not stopping:
+            first = await self.queue.get()
+            if first is None:
+                break
+            jobs = [first]
+            while len(jobs) < self.batch_size and not self.queue.empty():
+                job = self.queue.get_nowait()
+                if job is None:
+                    stopping = True
+                    break
+                jobs.append(job)
+            post_ids = [key for kind, key in jobs if kind == "post"]
+            user_ids = [key for kind, key in jobs if kind == "user"]
+            try:
+                async with engine.begin() as conn:
+                    self.rows += await fan_out(conn, post_ids, user_ids)
+                self.posts += len(post_ids)
+                self.users += len(user_ids)
+            except Exception:
+                # The posts themselves are committed; only their timeline copies are missing
+                self.failures += len(jobs)
+                logger.exception("Timeline fan-out failed for posts %s, users %s", post_ids, user_ids)
+
+    def stats(self) -> dict:
+        return {
+            "posts": self.posts,
+            "users": self.users,
+            "rows": self.rows,
+            "failures": self.failures,
+            "queued": self.queue.qsize() if self.queue else 0,
+        }
+
+
+timeline_fanout = TimelineFanout(settings.timeline_batch_size)
+
+
+async def fetch_timeline_page(
+    db: AsyncSession, user_id: int, cursor: Optional[str] = None, limit: Optional[int] = None
+) -> Tuple[List[FeedRow], Optional[str]]:
+    """One page of a user's timeline, newest first, and the cursor for the next page.
+
+    A single range scan on the timeline_entries primary key, joined to the
+    posts and their authors; cursors are the same as the home feed's.
+    """
+    limit = limit or settings.feed_page_size
+    query = (
+        select(*FEED_COLUMNS)
+        .select_from(timeline_entries)
+        .join(Post, Post.id == timeline_entries.c.post_id)
+        .join(User, Post.author_id == User.id)
+        .where(timeline_entries.c.user_id == user_id)
+    )
+    position = decode_cursor(cursor)
+    if position:
+        query = query.where(tuple_(timeline_entries.c.created_at, timeline_entries.c.post_id) < position)
+    query = query.order_by(timeline_entries.c.created_at.desc(), timeline_entries.c.post_id.desc()).limit(limit + 1)
+    posts = [FeedRow(*row) for row in await db.execute(query)]
+    next_cursor = None
+    if len(posts) > limit:
+        posts = posts[:limit]
+        next_cursor = encode_cursor(posts[-1])
+    return posts, next_cursor
+
+
+async def backfill(chunk_size: int = 500, echo=print) -> int:
+    """Copy every user's newest matching posts into their timeline; safe to re-run"""
+    await init_db()
+    start = time.perf_counter()
+    last_id, users, rows = 0, 0, 0
+    while True:
+        async with engine.begin() as conn:
+            user_ids = (await conn.execute(
+                select(User.id).where(User.id > last_id).order_by(User.id).limit(chunk_size))).scalars().all()
+            if not user_ids:
+                break
+            rows += await fan_out(conn, user_ids=user_ids)
+        users += len(user_ids)
+        last_id = user_ids[-1]
+        echo(f"timelines: {users} users, {rows} entries in {time.perf_counter() - start:.1f}s")
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.timeline", description="Materialized timeline jobs")
+    parser.add_argument("command", choices=["backfill"])
+    parser.add_argument("--chunk-size", type=int, default=500, help="users per transaction")
+    args = parser.parse_args(argv)
+
+    async def run():
+        try:
+            await backfill(args.chunk_size)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
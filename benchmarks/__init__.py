@@ -0,0 +1,10 @@
+"""Capacity benchmarks for SkillConnect.
+
+``benchmarks.datagen`` seeds a database with synthetic users and posts;
+``benchmarks.loadtest`` drives the ASGI app with a concurrent request mix
+and writes JSON results that can be compared against a stored baseline.
+The ``bench_*.py`` scripts are focused micro-benchmarks for single changes.
+
+    python -m benchmarks.datagen --url sqlite:///bench.db --users 100000 --posts 1000000
+    python -m benchmarks.loadtest --url sqlite:///bench.db --output results.json
+"""
@@ -0,0 +1,79 @@
+"""JSON API: feed page latency (orjson vs the legacy /api/feed) and the NDJSON stream.
+
+The stream is driven through the raw ASGI interface (httpx's ASGI transport
+buffers whole bodies) while tracemalloc records the peak allocation, which
+should stay flat as --posts grows.
+
+    python benchmarks/bench_api.py --posts 100000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"))
+
+import httpx  # noqa: E402
+
+from benchmarks.datagen import generate  # noqa: E402
+from main import app  # noqa: E402
+
+
+async def time_get(client, url, repeat):
+    await client.get(url)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        response = await client.get(url)
+        response.raise_for_status()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+async def stream_all(path):
+    """Consume a streaming response chunk by chunk, keeping nothing; returns (lines, bytes)"""
+    counted = [0, 0]
+    scope = {
+        "type": "http", "asgi": {"version": "3.0", "spec_version": "2.4"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            counted[0] += message.get("body", b"").count(b"\n")
+            counted[1] += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return counted
+
+
+async def main(users, posts, repeat):
+    await generate(users, posts, seed=42, echo=lambda line: None)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            for url in ("/api/feed?limit=100", "/api/v1/feed?limit=100"):
+                print(f"{url:<26}{await time_get(client, url, repeat):8.2f} ms/request")
+
+            tracemalloc.start()
+            start = time.perf_counter()
+            lines, size = await stream_all("/api/v1/posts/stream")
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"stream: {lines} posts, {size / 1e6:.1f} MB in {elapsed:.2f}s "
+                  f"({lines / elapsed:.0f} posts/s), peak allocation {peak / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--posts", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=200, help="requests per feed timing")
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.posts, args.repeat))
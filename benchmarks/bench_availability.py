@@ -0,0 +1,54 @@
+"""Cost of a username/phone availability check, with and without the Bloom filter.
+
+Seeds users (benchmarks.datagen), then times LoginFilter.taken for free
+names (the common signup case) and taken ones, with the filter unloaded
+(a query every time) and loaded.
+
+    python benchmarks/bench_availability.py --users 100000 --checks 5000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"))
+
+
+async def run(users: int, checks: int):
+    from app.bloom import LoginFilter
+    from app.config import settings
+    from app.database.connection import SessionLocal, engine
+    from benchmarks.datagen import generate
+
+    await generate(users, 0, echo=lambda line: print(f"seeded {line}"))
+    cases = {
+        "free": [(f"newcomer{i}", f"+1666{i:07d}") for i in range(checks)],
+        "taken": [(f"user{i % users + 1}", None) for i in range(checks)],
+    }
+    async with SessionLocal() as db:
+        for label, load in (("query only", False), ("bloom", True)):
+            logins = LoginFilter(settings.login_bloom_capacity, settings.login_bloom_error_rate)
+            if load:
+                start = time.perf_counter()
+                await logins.load(db)
+                print(f"bloom load: {users} users in {1000 * (time.perf_counter() - start):.0f} ms, "
+                      f"{len(logins.filter.bits) / 1024:.0f} KiB")
+            for case, names in cases.items():
+                start = time.perf_counter()
+                for username, phone in names:
+                    await logins.taken(db, username, phone)
+                elapsed = time.perf_counter() - start
+                print(f"{label:<11} {case:<6} {1e6 * elapsed / checks:8.1f} us/check   "
+                      f"(false positives {logins.false_positives})")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--checks", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.checks))
@@ -0,0 +1,92 @@
+"""Write and read throughput under each database engine profile.
+
+Each profile gets a fresh database. --writers tasks insert posts (one commit
+each) while --readers tasks page through the feed, for --seconds. Reports
+operations per second, failed operations (e.g. "database is locked") and
+connection pool checkout waits.
+
+    python benchmarks/bench_db_profiles.py --profiles default sqlite
+    python benchmarks/bench_db_profiles.py --profiles server --url postgresql://localhost/bench
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import delete  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker  # noqa: E402
+
+from app.database.connection import Base, PoolStats, TimedQueuePool, create_engine_for  # noqa: E402
+from app.feed import fetch_posts_page  # noqa: E402
+from app.models import Post, User  # noqa: E402
+
+
+async def writer(sessions, stop, counts):
+    while time.perf_counter() < stop:
+        try:
+            async with sessions() as db:
+                db.add(Post(title="Benchmark idea", description="x" * 200, required_skills="Python", author_id=1))
+                await db.commit()
+            counts["writes"] += 1
+        except Exception as exc:
+            counts["errors"] += 1
+            counts["last_error"] = str(exc).splitlines()[0][:80]
+
+
+async def reader(sessions, stop, counts):
+    while time.perf_counter() < stop:
+        try:
+            async with sessions() as db:
+                await fetch_posts_page(db, limit=20)
+            counts["reads"] += 1
+        except Exception as exc:
+            counts["errors"] += 1
+            counts["last_error"] = str(exc).splitlines()[0][:80]
+
+
+async def run_profile(url, profile, writers, readers, seconds):
+    TimedQueuePool.stats = stats = PoolStats()
+    engine = create_engine_for(url, profile)
+    sessions = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(delete(Post))
+        await conn.execute(delete(User))
+    async with sessions() as db:
+        db.add(User(id=1, username="bench", password_hash="x"))
+        await db.commit()
+
+    counts = {"writes": 0, "reads": 0, "errors": 0, "last_error": ""}
+    stop = time.perf_counter() + seconds
+    await asyncio.gather(
+        *[writer(sessions, stop, counts) for _ in range(writers)],
+        *[reader(sessions, stop, counts) for _ in range(readers)],
+    )
+    await engine.dispose()
+    snapshot = stats.snapshot()
+    print(
+        f"{profile:<10}{counts['writes'] / seconds:>10.0f}{counts['reads'] / seconds:>10.0f}{counts['errors']:>8}"
+        f"{snapshot['avg_wait_ms']:>12.2f}{snapshot['max_wait_ms']:>12.2f}  {counts['last_error']}"
+    )
+
+
+async def main(args):
+    print(f"{'profile':<10}{'writes/s':>10}{'reads/s':>10}{'errors':>8}{'avg wait':>12}{'max wait':>12}")
+    for profile in args.profiles:
+        url = args.url or "sqlite:///" + os.path.join(tempfile.mkdtemp(), f"{profile}.db")
+        await run_profile(url, profile, args.writers, args.readers, args.seconds)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--profiles", nargs="+", default=["default", "sqlite"], choices=["default", "sqlite", "server"])
+    parser.add_argument("--url", help="database URL (default: a fresh SQLite file per profile)")
+    parser.add_argument("--writers", type=int, default=20)
+    parser.add_argument("--readers", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=5)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,64 @@
+"""Concurrent throughput of the home feed (`GET /`).
+
+Seeds a throwaway SQLite database, then fires requests at the ASGI app from
+many concurrent clients and reports requests/second.
+
+    python benchmarks/bench_home.py --requests 2000 --concurrency 50
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+async def run(total: int, concurrency: int, posts: int):
+    import httpx
+    from main import app
+    from app.database.connection import SessionLocal
+    from app.models import User, Post
+
+    async with app.router.lifespan_context(app):
+        async with SessionLocal() as db:
+            author = User(username="bench", password_hash="x", is_active=True)
+            db.add(author)
+            await db.flush()
+            db.add_all(
+                Post(title=f"Idea {i}", description="Benchmark post", required_skills="Python, Design", author_id=author.id)
+                for i in range(posts)
+            )
+            await db.commit()
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            remaining = iter(range(total))
+
+            async def worker():
+                for _ in remaining:
+                    response = await client.get("/")
+                    response.raise_for_status()
+
+            start = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            elapsed = time.perf_counter() - start
+
+    print(f"GET / x{total} @ concurrency {concurrency}: {elapsed:.2f}s, {total / elapsed:.0f} req/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--posts", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        asyncio.run(run(args.requests, args.concurrency, args.posts))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Collaborator-matching latency at scale.
+
+Fills the in-memory MatchingEngine with synthetic users and posts (skills drawn
+from a Zipf-like distribution), then times top-k queries in both directions
+and incremental inserts.
+
+    python benchmarks/bench_matching.py --users 100000 --posts 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--skills", type=int, default=2_000)
+    parser.add_argument("-k", type=int, default=10)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    from app.matching import MatchingEngine
+
+    rng = np.random.default_rng(42)
+    popularity = 1.0 / np.arange(1, args.skills + 1)
+    popularity /= popularity.sum()
+
+    def draw(n):
+        counts = rng.integers(1, 6, size=n)
+        return np.split(rng.choice(args.skills, size=counts.sum(), p=popularity) + 1, np.cumsum(counts)[:-1])
+
+    engine = MatchingEngine()
+    start = time.perf_counter()
+    for user_id, skills in enumerate(draw(args.users), 1):
+        engine.add_user(user_id, skills.tolist())
+    for post_id, skills in enumerate(draw(args.posts), 1):
+        engine.add_post(post_id, post_id % args.users + 1, skills.tolist())
+    engine._refresh()
+    print(f"built {args.users} users x {args.posts} posts in {time.perf_counter() - start:.1f}s")
+
+    for label, query, n in (
+        ("collaborators_for_post", engine.collaborators_for_post, args.posts),
+        ("posts_for_user", engine.posts_for_user, args.users),
+    ):
+        ids = rng.integers(1, n + 1, size=200)
+        start = time.perf_counter()
+        for entity_id in ids:
+            query(int(entity_id), args.k)
+        print(f"{label:>24}: {(time.perf_counter() - start) / len(ids) * 1000:.2f} ms/query")
+
+    start = time.perf_counter()
+    for i in range(100):
+        engine.add_post(args.posts + i + 1, 1, [1, 2, 3])
+        engine.collaborators_for_post(args.posts + i + 1, args.k)
+    print(f"{'add_post + query':>24}: {(time.perf_counter() - start) / 100 * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Bytes on the wire per page view: HTML plus the stylesheet it references.
+
+A first view fetches the page and its stylesheet; a repeat view only
+refetches the page, since fingerprinted assets are served immutable.
+Inline CSS (older trees) counts as part of the page.
+
+    python benchmarks/bench_page_bytes.py --posts 20
+"""
+import argparse
+import asyncio
+import os
+import re
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"))
+
+import httpx  # noqa: E402
+
+from main import app  # noqa: E402
+
+PAGES = ["/", "/login", "/register", "/search"]
+STYLESHEET = re.compile(r'<link rel="stylesheet" href="([^"]+)"')
+
+
+async def wire_bytes(client, url, encoding):
+    # httpx decodes bodies transparently; Content-Length is what was sent
+    response = await client.get(url, headers={"accept-encoding": encoding})
+    sent = int(response.headers.get("content-length") or len(response.content))
+    return response, sent
+
+
+async def main(posts):
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            await client.post("/register", data={"username": "bench", "password": "pw", "skills": "Python, Design"})
+            for i in range(posts):
+                await client.post("/new-post", data={
+                    "title": f"Project idea {i}",
+                    "description": "Looking for collaborators to build a community tool. " * 4,
+                    "required_skills": "Python, Design, Marketing",
+                })
+            client.cookies.clear()
+
+            print(f"{'page':<12}{'encoding':<10}{'html':>8}{'css':>8}{'first':>8}{'repeat':>8}")
+            for encoding in ("identity", "gzip"):
+                for url in PAGES:
+                    response, html = await wire_bytes(client, url, encoding)
+                    match = STYLESHEET.search(response.text)
+                    css = (await wire_bytes(client, match.group(1), encoding))[1] if match else 0
+                    print(f"{url:<12}{encoding:<10}{html:>8}{css:>8}{html + css:>8}{html:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=20, help="posts on the home feed")
+    args = parser.parse_args()
+    asyncio.run(main(args.posts))
@@ -0,0 +1,103 @@
+"""Keyset vs OFFSET pagination cost at depth.
+
+Builds a throwaway SQLite database with --posts rows (1M by default), then
+times fetch_posts_page at several page depths and compares it with the
+equivalent OFFSET query. Also reports SQL statements issued per page.
+
+    python benchmarks/bench_pagination.py --posts 1000000
+"""
+import argparse
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PAGE_SIZE = 20
+
+
+def seed(path: str, posts: int, authors: int = 1000):
+    start = datetime(2024, 1, 1)
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO users (id, username, password_hash, is_active) VALUES (?, ?, 'x', 1)",
+        ((i, f"user{i}") for i in range(1, authors + 1)),
+    )
+    conn.executemany(
+        "INSERT INTO posts (id, title, description, author_id, created_at) VALUES (?, ?, 'Benchmark post', ?, ?)",
+        (
+            (i, f"Idea {i}", i % authors + 1, (start + timedelta(seconds=i // 3)).strftime("%Y-%m-%d %H:%M:%S"))
+            for i in range(1, posts + 1)
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+async def timed(coro_factory, repeat: int = 20) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await coro_factory()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+async def run(path: str, posts: int):
+    from sqlalchemy import event, select, text
+    from app.database.connection import SessionLocal, engine, init_db
+    from app.feed import encode_cursor, fetch_posts_page
+    from app.models import Post
+
+    await init_db()
+    seed(path, posts)
+
+    async with SessionLocal() as db:
+        plan = await db.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id FROM posts WHERE (created_at, id) < ('2024-06-01 00:00:00', 10) "
+            "ORDER BY created_at DESC, id DESC LIMIT 21"
+        ))
+        print("plan:", " / ".join(row[-1] for row in plan))
+
+        for depth in (1, 100, 10_000, posts // PAGE_SIZE - 1):
+            offset = (depth - 1) * PAGE_SIZE
+            cursor = None
+            if offset:
+                result = await db.execute(
+                    select(Post).order_by(Post.created_at.desc(), Post.id.desc()).offset(offset - 1).limit(1)
+                )
+                cursor = encode_cursor(result.scalars().one())
+
+            statements = []
+            listener = lambda *args: statements.append(args[2])
+            event.listen(engine.sync_engine, "before_cursor_execute", listener)
+            await fetch_posts_page(db, cursor=cursor)
+            event.remove(engine.sync_engine, "before_cursor_execute", listener)
+
+            keyset_ms = await timed(lambda: fetch_posts_page(db, cursor=cursor))
+            offset_ms = await timed(lambda: db.execute(
+                select(Post.id).order_by(Post.created_at.desc(), Post.id.desc()).offset(offset).limit(PAGE_SIZE)
+            ), repeat=3)
+            print(
+                f"page {depth:>7}: keyset {keyset_ms:7.2f} ms ({len(statements)} queries)   "
+                f"offset {offset_ms:8.2f} ms"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+        asyncio.run(run(path, args.posts))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Posts/second: commit per request vs group commit (app.posts.PostWriteQueue).
+
+--concurrency tasks create posts for --seconds through each path against a
+fresh SQLite file. Run once per engine profile to see the effect of the
+per-commit sync cost:
+
+    python benchmarks/bench_post_writes.py --profile default   # rollback journal, synchronous=FULL
+    python benchmarks/bench_post_writes.py --profile sqlite    # WAL, synchronous=NORMAL
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+async def run(args):
+    from app.database.connection import SessionLocal, init_db
+    from app.models import User
+    from app.posts import PostWriteQueue, create_post
+
+    await init_db()
+    async with SessionLocal() as db:
+        author = User(username="bench", password_hash="x", is_active=True)
+        db.add(author)
+        await db.commit()
+
+    async def direct():
+        async with SessionLocal() as db:
+            await create_post(db, author.id, "Benchmark idea", "x" * 200, "Python, Design")
+
+    writer = PostWriteQueue(args.batch_size, args.window_ms / 1000, args.durability)
+
+    async def grouped():
+        await writer.submit(author.id, "Benchmark idea", "x" * 200, "Python, Design")
+
+    print(f"{'path':<8}{'posts/s':>10}{'errors':>8}")
+    for name, create in (("direct", direct), ("group", grouped)):
+        if name == "group":
+            writer.start()
+        done, errors = 0, 0
+        stop = time.perf_counter() + args.seconds
+
+        async def worker():
+            nonlocal done, errors
+            while time.perf_counter() < stop:
+                try:
+                    await create()
+                    done += 1
+                except Exception:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+        extra = ""
+        if name == "group":
+            await writer.stop()
+            extra = f"  avg batch {writer.stats()['avg_batch']}"
+        print(f"{name:<8}{done / elapsed:>10.0f}{errors:>8}{extra}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", default="default", choices=["default", "sqlite"])
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--window-ms", type=float, default=5)
+    parser.add_argument("--durability", default="default", choices=["default", "full", "relaxed"])
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "writes.db")
+    os.environ["DB_PROFILE"] = args.profile
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
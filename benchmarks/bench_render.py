@@ -0,0 +1,105 @@
+"""Page rendering micro-benchmark: precompiled shell + str.join vs f-string concatenation.
+
+The "legacy" functions reproduce the previous main.render_html and the
+``posts_html += f"..."`` loop, without escaping.
+
+    python benchmarks/bench_render.py
+"""
+import os
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.feed import FeedRow  # noqa: E402
+from app.rendering import render_html, render_posts  # noqa: E402
+
+
+def legacy_render_html(title, content, user=None):
+    nav = f"""
+   <nav style="background: #2563eb; color: white; padding: 1rem;">
+  <div style="max-width: 1200px; margin: 0 auto; display: flex; justify-content: space-between; align-items: center; flex-wrap: wrap;">
+    <div style="display: flex; flex-direction: column; line-height: 1.2; margin-bottom: 0.5rem;">
+      <a href="/" style="color: white; text-decoration: none; font-size: 1.5rem; font-weight: bold;">SkillConnect</a>
+      <span style="font-size: 1.2rem; font-weight: normal;">for yatris of 2025</span>
+    </div>
+    <div style="display: flex; flex-wrap: wrap; justify-content: center; gap: 0.5rem;">
+      <a href="/" style="color: white; text-decoration: none;">Home</a>
+      {"<a href='/profile' style='color: white; text-decoration: none;'>Profile</a>" if user else ""}
+      {"<a href='/logout' style='color: white; text-decoration: none;'>Logout</a>" if user else "<a href='/login' style='color: white; text-decoration: none;'>Login</a>"}
+      {"" if user else "<a href='/register' style='color: white; text-decoration: none;'>Register</a>"}
+    </div>
+  </div>
+</nav>
+    """
+    return f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>{title} - SkillConnect</title>
+        <meta charset="utf-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1">
+        <style>
+            * {{ margin: 0; padding: 0; box-sizing: border-box; }}
+            body {{ font-family: Arial, sans-serif; background: #f5f5f5; }}
+            .container {{ max-width: 1200px; margin: 0 auto; padding: 2rem; }}
+            .card {{ background: white; padding: 2rem; border-radius: 8px; margin-bottom: 1rem; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
+            .form-group {{ margin-bottom: 1rem; }}
+            label {{ display: block; margin-bottom: 0.5rem; font-weight: bold; }}
+            input, textarea {{ width: 100%; padding: 0.5rem; border: 1px solid #ddd; border-radius: 4px; }}
+            button, .btn {{ background: #2563eb; color: white; padding: 0.75rem 1.5rem; border: none; border-radius: 4px; cursor: pointer; text-decoration: none; display: inline-block; }}
+            button:hover, .btn:hover {{ background: #1e40af; }}
+            .post {{ background: white; padding: 1.5rem; border-radius: 8px; margin-bottom: 1rem; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
+            .post h3 {{ color: #2563eb; margin-bottom: 0.5rem; }}
+            .post-meta {{ color: #666; font-size: 0.9rem; margin-top: 0.5rem; }}
+            .skills {{ background: #e0e7ff; color: #2563eb; padding: 0.25rem 0.75rem; border-radius: 12px; display: inline-block; margin: 0.25rem; font-size: 0.85rem; }}
+        </style>
+    </head>
+    <body>
+        {nav}
+        <div class="container">
+            {content}
+        </div>
+    </body>
+    </html>
+    """
+
+
+def legacy_render_posts(posts):
+    posts_html = ""
+    for post in posts:
+        skills_html = ""
+        if post.required_skills:
+            for skill in post.required_skills.split(","):
+                skills_html += f'<span class="skills">{skill.strip()}</span>'
+        posts_html += f"""
+        <div class="post">
+            <h3>{post.title}</h3>
+            <p>{post.description}</p>
+            <div>{skills_html}</div>
+            <div class="post-meta">Posted by {post.author_username} • {post.created_at.strftime('%Y-%m-%d')}</div>
+        </div>
+        """
+    return posts_html
+
+
+def main():
+    now = datetime(2025, 1, 1)
+    for count in (20, 200, 2000):
+        posts = [
+            FeedRow(i, f"Idea {i} & more", "A description " * 20, "Python, Design, Marketing", now, "someone")
+            for i in range(count)
+        ]
+        number = max(1, 20000 // count)
+        legacy = timeit.timeit(lambda: legacy_render_html("Home", legacy_render_posts(posts)), number=number)
+        current = timeit.timeit(lambda: render_html("Home", render_posts(posts)), number=number)
+        print(
+            f"{count:>5} posts: legacy {legacy / number * 1e6:9.1f} us   "
+            f"current {current / number * 1e6:9.1f} us (escaped)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Full-text search latency over a large post table.
+
+Builds a throwaway SQLite database with --posts synthetic ideas (1M by
+default, indexed through the FTS5 triggers as they are inserted), then times
+search_posts for common, rare and multi-word queries against a LIKE scan.
+
+    python benchmarks/bench_search.py --posts 1000000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WORDS = (
+    "app platform marketplace fintech health education farming logistics payments social "
+    "mobile web analytics community startup students travel food delivery energy climate "
+    "music games design hiring mentoring events local rural voice video chat ai robotics"
+).split()
+QUERIES = ["fintech", "quantumleap", "rural payments", "mentor", "delivery app local"]
+
+
+def seed(path: str, posts: int):
+    rng = random.Random(42)
+    conn = sqlite3.connect(path)
+    conn.execute("INSERT INTO users (id, username, password_hash, is_active) VALUES (1, 'bench', 'x', 1)")
+    rows = (
+        (
+            " ".join(rng.choices(WORDS, k=4)).title(),
+            " ".join(rng.choices(WORDS, k=30)) + (" quantumleap" if i % 50_000 == 0 else ""),
+        )
+        for i in range(posts)
+    )
+    conn.executemany("INSERT INTO posts (title, description, author_id) VALUES (?, ?, 1)", rows)
+    conn.commit()
+    conn.close()
+
+
+async def run(path: str, posts: int):
+    from sqlalchemy import or_, select
+    from app.database.connection import SessionLocal, init_db
+    from app.models import Post
+    from app.search import search_posts
+
+    await init_db()
+    start = time.perf_counter()
+    seed(path, posts)
+    print(f"seeded {posts} posts (FTS maintained by triggers) in {time.perf_counter() - start:.1f}s")
+
+    async with SessionLocal() as db:
+        for q in QUERIES:
+            timings = []
+            for _ in range(5):
+                start = time.perf_counter()
+                results, _ = await search_posts(db, q)
+                timings.append(time.perf_counter() - start)
+            page_two = time.perf_counter()
+            await search_posts(db, q, page=2)
+            page_two = time.perf_counter() - page_two
+
+            like = time.perf_counter()
+            await db.execute(
+                select(Post.id).where(or_(Post.title.like(f"%{q}%"), Post.description.like(f"%{q}%"))).limit(21)
+            )
+            like = time.perf_counter() - like
+            print(
+                f"{q!r:>22}: fts {min(timings) * 1000:8.2f} ms  page 2 {page_two * 1000:8.2f} ms  "
+                f"like {like * 1000:8.2f} ms  ({len(results)} hits on page 1)"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+        asyncio.run(run(path, args.posts))
+
+
+if __name__ == "__main__":
+    main()
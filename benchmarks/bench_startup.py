@@ -0,0 +1,112 @@
+"""Cold-start time: importing main, and booting the app until it can serve.
+
+Every sample is a fresh interpreter. "import" is the time to import main;
+"boot" adds the lifespan startup (schema check, assets, matching index).
+The seeded database has its schema version removed, so the first boot
+replays every migration (as when upgrading an old database) and is
+reported separately. Also lists which heavy optional modules are
+loaded once the app is ready.
+
+    python benchmarks/bench_startup.py --runs 10 --output startup.json
+    python benchmarks/bench_startup.py --baseline startup.json --tolerance 0.2
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+HEAVY_MODULES = ["numpy", "scipy", "passlib", "jose", "cryptography"]
+
+CHILD = """
+import asyncio, json, sys, time
+start = time.perf_counter()
+from main import app
+imported = time.perf_counter()
+
+async def boot():
+    async with app.router.lifespan_context(app):
+        return time.perf_counter()
+
+ready = asyncio.run(boot())
+print(json.dumps({
+    "import_ms": 1000 * (imported - start),
+    "boot_ms": 1000 * (ready - start),
+    "loaded": [name for name in %r if name in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def sample(env) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+async def seed(users: int, posts: int):
+    from benchmarks.datagen import generate
+    from app.database.connection import engine
+
+    await generate(users, posts, echo=lambda line: None)
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("DROP TABLE IF EXISTS schema_version")
+    await engine.dispose()
+
+
+def compare(results, baseline, tolerance: float):
+    return [
+        f"{key}: {baseline[key]} -> {results[key]} ms"
+        for key in ("import_ms", "boot_ms")
+        if results[key] > baseline[key] * (1 + tolerance)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--posts", type=int, default=10000)
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", help="compare against this results JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown")
+    args = parser.parse_args()
+
+    env = dict(os.environ, DATABASE_URL="sqlite:///" + os.path.join(tempfile.mkdtemp(), "startup.db"))
+    os.environ["DATABASE_URL"] = env["DATABASE_URL"]
+    asyncio.run(seed(args.users, args.posts))
+
+    first = sample(env)
+    runs = [sample(env) for _ in range(args.runs)]
+    results = {
+        "first_boot_ms": round(first["boot_ms"], 1),
+        "import_ms": round(statistics.median(run["import_ms"] for run in runs), 1),
+        "boot_ms": round(statistics.median(run["boot_ms"] for run in runs), 1),
+        "loaded_at_ready": runs[-1]["loaded"],
+    }
+    print(f"first boot (migrations)  {results['first_boot_ms']:8.1f} ms")
+    print(f"import main (median)     {results['import_ms']:8.1f} ms")
+    print(f"boot to ready (median)   {results['boot_ms']:8.1f} ms")
+    print(f"heavy modules at ready   {', '.join(results['loaded_at_ready']) or 'none'}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
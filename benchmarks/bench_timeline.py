@@ -0,0 +1,104 @@
+"""Timeline read latency: materialized timeline vs matching skills at read time.
+
+Seeds users and posts (benchmarks.datagen), backfills the timelines, then
+for a sample of users times one page of
+  timeline  - range scan on timeline_entries (app.timeline)
+  on-the-fly - posts joined to post_skills for the user's skills, newest first
+and the write side: fan-out time and rows written per new post.
+
+    python benchmarks/bench_timeline.py --users 5000 --posts 50000
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"))
+
+from sqlalchemy import insert, select  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.database.connection import SessionLocal, engine  # noqa: E402
+from app.feed import FEED_COLUMNS, FeedRow  # noqa: E402
+from app.models import Post, User, post_skills, user_skills  # noqa: E402
+from app.timeline import backfill, fan_out, fetch_timeline_page  # noqa: E402
+from benchmarks.datagen import generate  # noqa: E402
+
+
+async def matched_on_the_fly(db, user_id: int, limit: int):
+    """The read-time alternative: newest posts sharing any of the user's skills"""
+    skills = select(user_skills.c.skill_id).where(user_skills.c.user_id == user_id)
+    query = (
+        select(*FEED_COLUMNS)
+        .join(User, Post.author_id == User.id)
+        .where(Post.id.in_(select(post_skills.c.post_id).where(post_skills.c.skill_id.in_(skills))))
+        .where(Post.author_id != user_id)
+        .order_by(Post.created_at.desc(), Post.id.desc())
+        .limit(limit + 1)
+    )
+    return [FeedRow(*row) for row in await db.execute(query)]
+
+
+def summary(samples):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(0.95 * len(samples)))]
+    return f"p50 {1000 * statistics.median(samples):7.2f} ms   p95 {1000 * p95:7.2f} ms"
+
+
+async def main(users, posts, sample, new_posts):
+    await generate(users, posts, echo=lambda line: print(f"seeded {line}"))
+    start = time.perf_counter()
+    rows = await backfill(echo=lambda line: None)
+    print(f"backfill: {rows} entries in {time.perf_counter() - start:.1f}s")
+
+    rng = random.Random(7)
+    user_ids = rng.sample(range(1, users + 1), min(sample, users))
+    limit = settings.feed_page_size
+    timings = {"timeline": [], "on-the-fly": []}
+    async with SessionLocal() as db:
+        for user_id in user_ids:
+            start = time.perf_counter()
+            timeline, _ = await fetch_timeline_page(db, user_id, limit=limit)
+            timings["timeline"].append(time.perf_counter() - start)
+            start = time.perf_counter()
+            await matched_on_the_fly(db, user_id, limit)
+            timings["on-the-fly"].append(time.perf_counter() - start)
+    for name, samples in timings.items():
+        print(f"{name:<12}{summary(samples)}   ({len(samples)} users, {limit} posts/page)")
+
+    # Write side: fan out freshly inserted posts one transaction each
+    async with engine.begin() as conn:
+        post_ids = []
+        for _ in range(new_posts):
+            result = await conn.execute(insert(Post).values(
+                title="Benchmark idea", description="Fan-out benchmark", author_id=rng.randint(1, users)))
+            post_ids.append(result.inserted_primary_key[0])
+        skill_ids = (await conn.execute(select(post_skills.c.skill_id).distinct())).scalars().all()
+        await conn.execute(insert(post_skills), [
+            {"post_id": post_id, "skill_id": skill_id}
+            for post_id in post_ids for skill_id in rng.sample(skill_ids, 2)
+        ])
+    fan_out_times, written = [], 0
+    for post_id in post_ids:
+        start = time.perf_counter()
+        async with engine.begin() as conn:
+            written += await fan_out(conn, post_ids=[post_id])
+        fan_out_times.append(time.perf_counter() - start)
+    print(f"{'fan-out':<12}{summary(fan_out_times)}   ({written / len(post_ids):.0f} rows/post, "
+          f"cap {settings.timeline_fanout_cap})")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--posts", type=int, default=50000)
+    parser.add_argument("--sample", type=int, default=200, help="users whose first page is timed")
+    parser.add_argument("--new-posts", type=int, default=100, help="posts fanned out for the write-side timing")
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.posts, args.sample, args.new_posts))
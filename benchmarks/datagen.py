@@ -0,0 +1,164 @@
+"""Seeded synthetic data: users and posts with a long-tailed skill distribution.
+
+Skills are drawn from a fixed vocabulary with Zipf-like weights, so a few
+skills (Python, JavaScript, Design...) are very common and most are rare.
+Posts are spread over the past year in id order, authors are skewed towards
+a minority of active users, and every user's password is "password".
+The same --seed always produces the same rows.
+
+    python -m benchmarks.datagen --url sqlite:///bench.db --users 100000 --posts 1000000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from itertools import accumulate
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SKILLS = [
+    "Python", "JavaScript", "Design", "Marketing", "React", "Writing", "Data Analysis", "Java",
+    "Project Management", "Sales", "SQL", "UI/UX", "Photography", "Video Editing", "Node.js",
+    "Machine Learning", "Public Speaking", "Finance", "Go", "Rust", "Figma", "Social Media",
+    "Content Strategy", "DevOps", "Kubernetes", "AWS", "Flutter", "Swift", "Kotlin", "C++",
+    "Community Building", "Fundraising", "Legal", "Accounting", "Illustration", "3D Modeling",
+    "Music Production", "Teaching", "Research", "Hardware", "Embedded Systems", "Electronics",
+    "Product Management", "Copywriting", "SEO", "Translation", "Event Planning", "Operations",
+    "Customer Support", "Data Engineering", "Statistics", "Blockchain", "Security", "Networking",
+    "Game Development", "Unity", "Animation", "Biology", "Chemistry", "Agriculture",
+]
+WORDS = (
+    "build launch community platform tool app local students farmers health education open source "
+    "prototype startup market research mentors volunteers data dashboard mobile web network rural "
+    "clean energy water climate small business artists musicians design sprint weekend hackathon "
+    "library map transport food waste recycling tutoring language learning finance budgeting"
+).split()
+PASSWORD = "password"
+
+
+def zipf_weights(n: int, s: float = 1.1):
+    return [1 / (rank ** s) for rank in range(1, n + 1)]
+
+
+class Generator:
+    """Deterministic row factory; all randomness comes from one seeded Random"""
+
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+        self.skill_weights = list(accumulate(zipf_weights(len(SKILLS))))
+
+    def skills(self, low: int, high: int):
+        count = self.rng.randint(low, high)
+        return list(dict.fromkeys(self.rng.choices(SKILLS, cum_weights=self.skill_weights, k=count)))
+
+    def sentence(self, words: int) -> str:
+        return " ".join(self.rng.choices(WORDS, k=words)).capitalize()
+
+    def user(self, user_id: int, password_hash: str):
+        skills = self.skills(1, 6)
+        return {
+            "id": user_id,
+            "username": f"user{user_id}",
+            "phone": f"+1555{user_id:07d}",
+            "password_hash": password_hash,
+            "full_name": f"User {user_id}",
+            "skills": ", ".join(skills),
+            "bio": self.sentence(12),
+            "is_active": True,
+        }, skills
+
+    def post(self, post_id: int, author_id: int, created_at: datetime):
+        skills = self.skills(1, 4)
+        return {
+            "id": post_id,
+            "title": self.sentence(5),
+            "description": ". ".join(self.sentence(self.rng.randint(8, 20)) for _ in range(self.rng.randint(1, 4))),
+            "required_skills": ", ".join(skills),
+            "author_id": author_id,
+            "created_at": created_at,
+        }, skills
+
+
+def batched(iterable, size: int):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def generate(users: int, posts: int, seed: int = 42, batch_size: int = 5000, echo=print):
+    """Insert users and posts (plus skill links) into the configured database"""
+    from sqlalchemy import func, insert, select
+
+    from app.auth.auth import get_password_hash
+    from app.database.connection import engine, init_db
+    from app.models import Post, User, post_skills, user_skills
+    from app.skills import canonicalize_skill, get_or_create_skill_ids
+
+    await init_db()
+    gen = Generator(seed)
+    password_hash = get_password_hash(PASSWORD)
+
+    async with engine.begin() as conn:
+        skill_ids = await conn.run_sync(get_or_create_skill_ids, [canonicalize_skill(s) for s in SKILLS])
+        first_user = ((await conn.execute(select(func.max(User.id)))).scalar() or 0) + 1
+        first_post = ((await conn.execute(select(func.max(Post.id)))).scalar() or 0) + 1
+
+    def link_rows(owner_key, owner_id, skills):
+        return [{owner_key: owner_id, "skill_id": skill_ids[canonicalize_skill(s)]} for s in skills]
+
+    start = time.perf_counter()
+    user_ids = range(first_user, first_user + users)
+    for batch in batched(user_ids, batch_size):
+        rows, links = [], []
+        for user_id in batch:
+            row, skills = gen.user(user_id, password_hash)
+            rows.append(row)
+            links.extend(link_rows("user_id", user_id, skills))
+        async with engine.begin() as conn:
+            await conn.execute(insert(User), rows)
+            await conn.execute(insert(user_skills), links)
+    echo(f"{users} users in {time.perf_counter() - start:.1f}s")
+
+    # A minority of users write most posts
+    author_weights = list(accumulate(zipf_weights(len(user_ids), s=0.8)))
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    step = timedelta(days=365) / max(posts, 1)
+    start = time.perf_counter()
+    for batch in batched(range(posts), batch_size):
+        authors = gen.rng.choices(user_ids, cum_weights=author_weights, k=len(batch))
+        rows, links = [], []
+        for offset, author_id in zip(batch, authors):
+            post_id = first_post + offset
+            row, skills = gen.post(post_id, author_id, now - timedelta(days=365) + step * offset)
+            rows.append(row)
+            links.extend(link_rows("post_id", post_id, skills))
+        async with engine.begin() as conn:
+            await conn.execute(insert(Post), rows)
+            await conn.execute(insert(post_skills), links)
+    echo(f"{posts} posts in {time.perf_counter() - start:.1f}s")
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="sqlite:///bench.db", help="database URL to seed")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = args.url
+    asyncio.run(generate(args.users, args.posts, args.seed, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""In-process load driver for the main pages, with baseline comparison.
+
+Virtual users share one ASGI transport (no network, no server process) and
+pick requests from a weighted mix of home, profile, login, register and
+new-post for --duration seconds. Each virtual user signs in as a seeded
+user first. Reports per-route p50/p95/p99 latency, throughput and SQL
+statements per request, optionally saves them as JSON, and compares them
+with a saved baseline (exit status 1 on regression).
+
+Without --url a throwaway SQLite database is seeded with benchmarks.datagen.
+Login and register are bcrypt-bound; set BCRYPT_ROUNDS (e.g. 4) before
+seeding to measure everything else.
+
+    python -m benchmarks.loadtest --duration 30 --concurrency 50 --output results.json
+    python -m benchmarks.loadtest --baseline results.json --tolerance 0.2
+"""
+import argparse
+import asyncio
+import contextvars
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_MIX = "home=50,profile=20,new_post=15,login=10,register=5"
+
+# SQL statements issued while serving the current request
+query_counter = contextvars.ContextVar("query_counter", default=None)
+
+
+def parse_mix(text: str):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    unknown = set(mix) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+    return mix
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class VirtualUser:
+    def __init__(self, client, signups, number: int, users: int):
+        self.client = client
+        # Registering signs a client in as the new user, so signups use their
+        # own client and the seeded user's session is never replaced
+        self.signups = signups
+        self.number = number
+        self.username = f"user{number % users + 1}"
+        self.registered = 0
+
+    async def home(self):
+        return await self.client.get("/")
+
+    async def profile(self):
+        return await self.client.get("/profile")
+
+    async def login(self):
+        from benchmarks.datagen import PASSWORD
+        return await self.client.post("/login", data={"username": self.username, "password": PASSWORD})
+
+    async def register(self):
+        self.registered += 1
+        username = f"load{os.getpid()}_{self.number}_{self.registered}_{time.monotonic_ns()}"
+        return await self.signups.post("/register", data={"username": username, "password": "pw", "skills": "Python, Design"})
+
+    async def new_post(self):
+        return await self.client.post("/new-post", data={
+            "title": "Load test idea",
+            "description": "Looking for collaborators on a load test",
+            "required_skills": "Python, Go",
+        })
+
+
+SCENARIOS = {
+    "home": VirtualUser.home,
+    "profile": VirtualUser.profile,
+    "login": VirtualUser.login,
+    "register": VirtualUser.register,
+    "new_post": VirtualUser.new_post,
+}
+
+
+async def drive(app, mix, concurrency: int, duration: float, users: int, seed: int):
+    import random
+
+    import httpx
+
+    samples = {name: [] for name in mix}
+    errors = {name: 0 for name in mix}
+    queries = {name: 0 for name in mix}
+    names, weights = list(mix), list(mix.values())
+
+    signed_in = []
+    started = asyncio.Event()
+    window = {}
+
+    async def run_user(number: int):
+        rng = random.Random(seed + number)
+        # A client address per virtual user, as admission control rate-limits per IP
+        transport = httpx.ASGITransport(app=app, client=(f"10.{number >> 16 & 255}.{number >> 8 & 255}.{number & 255}", 1))
+        async with httpx.AsyncClient(transport=transport, base_url="http://load") as client, \
+                httpx.AsyncClient(transport=transport, base_url="http://load") as signups:
+            user = VirtualUser(client, signups, number, users)
+            await user.login()
+            # Start the clock once every virtual user is signed in
+            signed_in.append(number)
+            if len(signed_in) == concurrency:
+                window["start"] = time.perf_counter()
+                window["stop"] = window["start"] + duration
+                started.set()
+            await started.wait()
+            while time.perf_counter() < window["stop"]:
+                name = rng.choices(names, weights)[0]
+                counter = {"queries": 0}
+                token = query_counter.set(counter)
+                start = time.perf_counter()
+                try:
+                    response = await SCENARIOS[name](user)
+                    failed = response.status_code >= 400
+                except Exception:
+                    failed = True
+                finally:
+                    query_counter.reset(token)
+                samples[name].append(time.perf_counter() - start)
+                queries[name] += counter["queries"]
+                errors[name] += failed
+
+    await asyncio.gather(*(run_user(number) for number in range(concurrency)))
+    elapsed = time.perf_counter() - window["start"]
+    return summarize(samples, errors, queries, elapsed)
+
+
+def summarize(samples, errors, queries, elapsed: float):
+    routes = {}
+    for name, durations in samples.items():
+        durations.sort()
+        count = len(durations)
+        routes[name] = {
+            "requests": count,
+            "errors": errors[name],
+            "rps": round(count / elapsed, 2),
+            "p50_ms": round(1000 * percentile(durations, 0.50), 2),
+            "p95_ms": round(1000 * percentile(durations, 0.95), 2),
+            "p99_ms": round(1000 * percentile(durations, 0.99), 2),
+            "queries_per_request": round(queries[name] / count, 2) if count else 0.0,
+        }
+    every = sorted(d for durations in samples.values() for d in durations)
+    total = {
+        "requests": len(every),
+        "errors": sum(errors.values()),
+        "rps": round(len(every) / elapsed, 2),
+        "p50_ms": round(1000 * percentile(every, 0.50), 2),
+        "p95_ms": round(1000 * percentile(every, 0.95), 2),
+        "p99_ms": round(1000 * percentile(every, 0.99), 2),
+        "queries_per_request": round(sum(queries.values()) / len(every), 2) if every else 0.0,
+    }
+    return {"routes": routes, "total": total}
+
+
+def compare(results, baseline, tolerance: float):
+    """Regressions of results against baseline: slower p95, lower throughput or more queries"""
+    regressions = []
+    for name, base in {**baseline["routes"], "total": baseline["total"]}.items():
+        current = results["total"] if name == "total" else results["routes"].get(name)
+        if not current or not base["requests"]:
+            continue
+        if current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {base['p95_ms']} -> {current['p95_ms']} ms")
+        if current["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {base['rps']} -> {current['rps']} req/s")
+        if current["queries_per_request"] > base["queries_per_request"] + 0.5:
+            regressions.append(f"{name}: queries/request {base['queries_per_request']} -> {current['queries_per_request']}")
+    return regressions
+
+
+def print_table(results):
+    print(f"{'route':<10}{'requests':>9}{'errors':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'queries':>9}")
+    for name, row in {**results["routes"], "total": results["total"]}.items():
+        print(
+            f"{name:<10}{row['requests']:>9}{row['errors']:>8}{row['rps']:>9.1f}{row['p50_ms']:>9.1f}"
+            f"{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}{row['queries_per_request']:>9.2f}"
+        )
+
+
+async def run(args):
+    from sqlalchemy import event
+
+    if not args.url:
+        from benchmarks.datagen import generate
+        await generate(args.users, args.posts, args.seed, echo=lambda line: print(f"seeded {line}"))
+
+    from main import app
+    from app.database.connection import engine, read_engine
+
+    def count_query(*_):
+        counter = query_counter.get()
+        if counter is not None:
+            counter["queries"] += 1
+
+    for each in {engine, read_engine}:
+        event.listen(each.sync_engine, "before_cursor_execute", count_query)
+
+    async with app.router.lifespan_context(app):
+        results = await drive(app, parse_mix(args.mix), args.concurrency, args.duration, args.users, args.seed)
+
+    results["meta"] = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "mix": args.mix,
+        "database": args.url or f"seeded sqlite ({args.users} users, {args.posts} posts)",
+    }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="already-seeded database URL (default: seed a temporary SQLite file)")
+    parser.add_argument("--users", type=int, default=1000, help="seeded users (to seed, and to sign in as)")
+    parser.add_argument("--posts", type=int, default=10000, help="posts to seed when --url is not given")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"scenario weights (default {DEFAULT_MIX})")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", help="compare against this results JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative p95/throughput change")
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = args.url or "sqlite:///" + os.path.join(tempfile.mkdtemp(), "load.db")
+    results = asyncio.run(run(args))
+    print_table(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,133 +1,231 @@
-from fastapi import FastAPI, Depends, HTTPException, Form, Request
-from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi import FastAPI, Depends, HTTPException, Form, Request, Query
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, Response, StreamingResponse
+from fastapi.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
-from sqlalchemy.orm import Session
+from typing import AsyncIterator
+from urllib.parse import quote
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 
-from app.database.connection import init_db, get_db
+from app.database.connection import (
+    init_db, get_db, get_read_db, read_sessions, stick_to_primary, warm_pool, SessionLocal, engine, read_engine, pool_stats
+)
 from app.auth.auth import (
-    get_password_hash, 
+    hash_password_async,
     authenticate_user, 
     create_access_token,
     get_user_by_username,
-    get_current_user_optional
+    get_current_user_optional,
+    shutdown_password_executor,
+    password_gate,
+    drop_cached_users,
+    user_cache
+)
+from app.invalidation import invalidation_log
+from app.bloom import login_filter
+from app.admission import AdmissionMiddleware, Overloaded, rejection
+from app.models import User
+from app.feed import FeedRow, PostPageStream, decode_cursor, fetch_posts_page, fetch_posts_by_ids
+from app.cache import CachedPage, feed_cache, not_modified
+from app.matching import matching_engine
+from app.skills import set_user_skills
+from app.rendering import (
+    escape, render_collaborator, render_html, render_post, render_posts, render_search_result, render_skills,
+    stream_html, use_stylesheet
 )
-from app.models import User, Post
+from app.assets import AssetStaticFiles, assets
+from app.posts import create_post as create_post_direct, post_writer
+from app import metrics
+from app.api import v1 as api_v1
+from app.search import search_posts
+from app.timeline import fetch_timeline_page, timeline_fanout
 from app.config import settings
 
 
+async def reindex_posts(post_ids):
+    """Invalidation log handler: posts created by another worker (None: reload everything)"""
+    async with SessionLocal() as db:
+        if post_ids is None:
+            await matching_engine.load(db)
+        else:
+            await matching_engine.load_posts(db, map(int, post_ids))
+    feed_cache.invalidate()
+
+
+async def reindex_users(user_ids):
+    """Invalidation log handler: users whose skills another worker wrote"""
+    async with SessionLocal() as db:
+        if user_ids is None:
+            await matching_engine.load(db)
+        else:
+            await matching_engine.load_users(db, map(int, user_ids))
+
+
+async def add_taken_logins(keys):
+    """Invalidation log handler: usernames/phones registered by another worker"""
+    if keys is None:
+        if settings.login_bloom_enabled:
+            async with SessionLocal() as db:
+                await login_filter.load(db)
+    else:
+        login_filter.add_keys(keys)
+
+
+invalidation_log.subscribe("posts", reindex_posts)
+invalidation_log.subscribe("user_skills", reindex_users)
+invalidation_log.subscribe("user_cache", drop_cached_users)
+invalidation_log.subscribe("logins", add_taken_logins)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup - Create tables
     await init_db()
+    await warm_pool(engine, settings.db_pool_warm)
+    if read_engine is not engine:
+        await warm_pool(read_engine, settings.db_pool_warm)
+    # Fingerprint and precompress static files, then link the hashed stylesheet
+    assets.build()
+    use_stylesheet(assets.url("css/app.css"))
+    # Follow other workers' changes from before the caches below are filled
+    invalidation_log.start()
+    async with SessionLocal() as db:
+        await matching_engine.load(db)
+        if settings.login_bloom_enabled:
+            await login_filter.load(db)
+    loop_monitor = metrics.start_event_loop_monitor() if settings.metrics_enabled else None
+    if settings.post_write_mode == "group":
+        post_writer.start()
+    if settings.timeline_enabled:
+        timeline_fanout.start()
     yield
     # Shutdown
+    await post_writer.stop()
+    await timeline_fanout.stop()
+    await invalidation_log.stop()
+    if loop_monitor:
+        loop_monitor.cancel()
+    shutdown_password_executor()
 
 
 # Initialize FastAPI app
 app = FastAPI(title="SkillConnect", description="Connect Skills with Opportunities", lifespan=lifespan)
+app.add_middleware(GZipMiddleware, minimum_size=settings.gzip_min_size)
+if settings.admission_enabled:
+    # bcrypt-bound routes, and the account lookup; added before metrics so rejections are still measured
+    app.add_middleware(
+        AdmissionMiddleware, paths=("/login", "/register"), gate=password_gate, lookups=("/api/availability",)
+    )
+
+if settings.metrics_enabled:
+    app.add_middleware(metrics.MetricsMiddleware)
+    metrics.instrument_engine(engine, "primary")
+    engines = {"primary": engine}
+    if read_engine is not engine:
+        metrics.instrument_engine(read_engine, "replica")
+        engines["replica"] = read_engine
+    metrics.register_pools(engines, pool_stats)
+    metrics.register_cache("feed", feed_cache)
+    metrics.register_cache("users", user_cache)
+
+app.include_router(api_v1.router)
+
+@app.exception_handler(Overloaded)
+async def overloaded_handler(request: Request, exc: Overloaded):
+    """Password pool over its latency budget after the request was admitted"""
+    route = getattr(request.scope.get("route"), "path", request.url.path)
+    return rejection(route, "overloaded", exc.retry_after)
+
 
 # Mount static files if directory exists
 try:
-    app.mount("/static", StaticFiles(directory="app/static"), name="static")
+    app.mount("/static", AssetStaticFiles(directory="app/static"), name="static")
 except:
     pass
 
 
-def render_html(title: str, content: str, user=None) -> str:
-    """Simple HTML template"""
-    nav = f"""
-   <nav style="background: #2563eb; color: white; padding: 1rem;">
-  <div style="max-width: 1200px; margin: 0 auto; display: flex; justify-content: space-between; align-items: center; flex-wrap: wrap;">
-    
-    <!-- Logo section -->
-    <div style="display: flex; flex-direction: column; line-height: 1.2; margin-bottom: 0.5rem;">
-      <a href="/" style="color: white; text-decoration: none; font-size: 1.5rem; font-weight: bold;">SkillConnect</a>
-      <span style="font-size: 1.2rem; font-weight: normal;">for yatris of 2025</span>
-    </div>
-
-    <!-- Nav links -->
-    <div style="display: flex; flex-wrap: wrap; justify-content: center; gap: 0.5rem;">
-      <a href="/" style="color: white; text-decoration: none;">Home</a>
-      {"<a href='/profile' style='color: white; text-decoration: none;'>Profile</a>" if user else ""}
-      {"<a href='/logout' style='color: white; text-decoration: none;'>Logout</a>" if user else "<a href='/login' style='color: white; text-decoration: none;'>Login</a>"}
-      {"" if user else "<a href='/register' style='color: white; text-decoration: none;'>Register</a>"}
-    </div>
+async def html_response(title: str, chunks: AsyncIterator[str], user=None) -> Response:
+    """Send a page built from content chunks, streamed if STREAM_HTML_PAGES is on.
 
-  </div>
-</nav>
-
-    """
-    
-    return f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>{title} - SkillConnect</title>
-        <meta charset="utf-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1">
-        <style>
-            * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-            body {{ font-family: Arial, sans-serif; background: #f5f5f5; }}
-            .container {{ max-width: 1200px; margin: 0 auto; padding: 2rem; }}
-            .card {{ background: white; padding: 2rem; border-radius: 8px; margin-bottom: 1rem; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
-            .form-group {{ margin-bottom: 1rem; }}
-            label {{ display: block; margin-bottom: 0.5rem; font-weight: bold; }}
-            input, textarea {{ width: 100%; padding: 0.5rem; border: 1px solid #ddd; border-radius: 4px; }}
-            button, .btn {{ background: #2563eb; color: white; padding: 0.75rem 1.5rem; border: none; border-radius: 4px; cursor: pointer; text-decoration: none; display: inline-block; }}
-            button:hover, .btn:hover {{ background: #1e40af; }}
-            .post {{ background: white; padding: 1.5rem; border-radius: 8px; margin-bottom: 1rem; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
-            .post h3 {{ color: #2563eb; margin-bottom: 0.5rem; }}
-            .post-meta {{ color: #666; font-size: 0.9rem; margin-top: 0.5rem; }}
-            .skills {{ background: #e0e7ff; color: #2563eb; padding: 0.25rem 0.75rem; border-radius: 12px; display: inline-block; margin: 0.25rem; font-size: 0.85rem; }}
-        </style>
-    </head>
-    <body>
-        {nav}
-        <div class="container">
-            {content}
-        </div>
-    </body>
-    </html>
+    A streamed body is produced after the handler returns, when the
+    request's dependency-scoped session may already be closed, so chunks
+    must open their own session (see read_sessions).
     """
+    if settings.stream_html_pages:
+        return StreamingResponse(stream_html(title, chunks, user), media_type="text/html")
+    return HTMLResponse(render_html(title, "".join([chunk async for chunk in chunks]), user))
 
 
 @app.get("/", response_class=HTMLResponse)
-async def home(user=Depends(get_current_user_optional), db: Session = Depends(get_db)):
-    """Home page with post feed"""
-    posts = db.query(Post).order_by(Post.created_at.desc()).limit(20).all()
+async def home(
+    request: Request,
+    cursor: str = None,
+    feed: str = None,
+    user=Depends(get_current_user_optional),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Home page: ideas matching the user's skills, or every recent idea"""
+    # Cursor pages are stable under keyset pagination, so they cache as well as page one
+    page_key = cursor if decode_cursor(cursor) else None
+    if user and settings.timeline_enabled and feed != "all":
+        posts, next_cursor = await fetch_timeline_page(db, user.id, cursor=page_key)
+        # Nothing matched yet (no skills, or before a backfill): show everything instead
+        if posts or page_key:
+            posts_html = render_posts(posts) or "<p>No more matching ideas.</p>"
+            if next_cursor:
+                posts_html += f'<a href="/?cursor={next_cursor}" class="btn">Older Ideas</a>'
+            heading = 'Ideas Matching Your Skills <a href="/?feed=all" style="font-size: 1rem;">All ideas</a>'
+            return render_html("Home", home_content(user, heading, posts_html), user)
+
+    generation = feed_cache.generation
+    if not user:
+        page = feed_cache.get(("page", page_key))
+        if page:
+            return cached_html_response(request, page)
     
-    posts_html = ""
-    for post in posts:
-        skills_html = ""
-        if post.required_skills:
-            for skill in post.required_skills.split(","):
-                skills_html += f'<span class="skills">{skill.strip()}</span>'
+    fragment = feed_cache.get(("fragment", page_key))
+    if fragment:
+        posts_html = fragment.body
+    else:
+        # Cached entries come from the primary: a lagging replica read made after
+        # an invalidation would otherwise be cached under the new generation
+        async with SessionLocal() as primary:
+            posts, next_cursor = await fetch_posts_page(primary, cursor=page_key)
         
-        posts_html += f"""
-        <div class="post">
-            <h3>{post.title}</h3>
-            <p>{post.description}</p>
-            <div>{skills_html}</div>
-            <div class="post-meta">Posted by {post.author.username} • {post.created_at.strftime('%Y-%m-%d')}</div>
-        </div>
-        """
-    
-    if not posts_html:
-        posts_html = "<p>No posts yet. Be the first to share an idea!</p>"
+        posts_html = render_posts(posts)
+        
+        if not posts_html:
+            posts_html = "<p>No posts yet. Be the first to share an idea!</p>"
+        if next_cursor:
+            posts_html += f'<a href="/?feed=all&cursor={next_cursor}" class="btn">Older Ideas</a>'
+        feed_cache.put(("fragment", page_key), posts_html, generation)
     
-    content = f"""
+    content = home_content(user, "Recent Ideas", posts_html)
+    if user:
+        return render_html("Home", content, user)
+    return cached_html_response(request, feed_cache.put(("page", page_key), render_html("Home", content), generation))
+
+
+def home_content(user, heading: str, posts_html: str) -> str:
+    return f"""
     <div class="card">
         <h2>Welcome to SkillConnect</h2>
         <p>A platform where you can share your startup ideas and find skilled people to collaborate with.</p>
         {f"<a href='/new-post' class='btn' style='margin-top: 1rem;'>Post Your Idea</a>" if user else "<p style='margin-top: 1rem;'><a href='/login'>Login</a> or <a href='/register'>Register</a> to post ideas.</p>"}
     </div>
-    <h2 style="margin: 2rem 0 1rem;">Recent Ideas</h2>
+    <h2 style="margin: 2rem 0 1rem;">{heading}</h2>
     {posts_html}
     """
-    
-    return render_html("Home", content, user)
+
+
+def cached_html_response(request: Request, page: CachedPage) -> Response:
+    """Serve a cached page, or 304 if the client's copy is still current"""
+    headers = {"ETag": page.etag, "Last-Modified": page.last_modified, "Cache-Control": "no-cache"}
+    if not_modified(page, request.headers.get("if-none-match"), request.headers.get("if-modified-since")):
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(page.body, headers=headers)
 
 
 @app.get("/login", response_class=HTMLResponse)
@@ -154,9 +252,9 @@ async def login_page():
 
 
 @app.post("/login")
-async def login(username: str = Form(...), password: str = Form(...), db: Session = Depends(get_db)):
+async def login(username: str = Form(...), password: str = Form(...), db: AsyncSession = Depends(get_db)):
     """Handle login"""
-    user = authenticate_user(db, username, password)
+    user = await authenticate_user(db, username, password)
     if not user:
         content = """
         <div class="card" style="max-width: 500px; margin: 2rem auto;">
@@ -216,6 +314,18 @@ async def register_page():
     return render_html("Register", content)
 
 
+def registration_failed(taken) -> str:
+    reasons = {"username": "Username is already taken.", "phone": "Phone number is already registered."}
+    content = f"""
+    <div class="card" style="max-width: 500px; margin: 2rem auto;">
+        <h2 style="color: red;">Registration Failed</h2>
+        {"".join(f"<p>{reasons[field]}</p>" for field in taken)}
+        <a href="/register" class="btn">Try Again</a>
+    </div>
+    """
+    return render_html("Registration Failed", content)
+
+
 @app.post("/register")
 async def register(
     username: str = Form(...),
@@ -224,23 +334,17 @@ async def register(
     full_name: str = Form(None),
     skills: str = Form(None),
     bio: str = Form(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Handle registration"""
-    # Check if username exists
-    existing_user = get_user_by_username(db, username)
-    if existing_user:
-        content = """
-        <div class="card" style="max-width: 500px; margin: 2rem auto;">
-            <h2 style="color: red;">Registration Failed</h2>
-            <p>Username already exists.</p>
-            <a href="/register" class="btn">Try Again</a>
-        </div>
-        """
-        return render_html("Registration Failed", content)
+    phone = (phone or "").strip() or None  # An empty field is no phone, not a second "" to collide on
+    # Check if username or phone is taken (usually answered by the Bloom filter alone)
+    taken = await login_filter.taken(db, username, phone)
+    if taken:
+        return registration_failed(taken)
     
     # Create new user
-    hashed_password = get_password_hash(password)
+    hashed_password = await hash_password_async(password)
     new_user = User(
         username=username,
         phone=phone,
@@ -252,8 +356,21 @@ async def register(
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    try:
+        await db.flush()
+    except IntegrityError:
+        # Registered since the check above by a concurrent request or another worker,
+        # possibly before this worker's filter heard of it: make the recheck query
+        await db.rollback()
+        login_filter.add_keys(login_filter.keys(username, phone))
+        return registration_failed(await login_filter.taken(db, username, phone) or ["username"])
+    skill_ids = await db.run_sync(set_user_skills, new_user.id, skills)
+    await db.commit()
+    login_filter.add_keys(login_filter.keys(username, phone))
+    invalidation_log.publish("logins", login_filter.keys(username, phone))
+    matching_engine.add_user(new_user.id, skill_ids)
+    invalidation_log.publish("user_skills", [new_user.id])
+    timeline_fanout.enqueue_user(new_user.id)
     
     # Automatically log in the user after registration
     access_token = create_access_token(
@@ -263,7 +380,7 @@ async def register(
     
     response = RedirectResponse("/", status_code=302)
     response.set_cookie(key="access_token", value=f"Bearer {access_token}", httponly=True)
-    return response
+    return stick_to_primary(response)
 
 
 @app.get("/logout")
@@ -275,52 +392,54 @@ async def logout():
 
 
 @app.get("/profile", response_class=HTMLResponse)
-async def profile(user=Depends(get_current_user_optional), db: Session = Depends(get_db)):
+async def profile(
+    request: Request,
+    cursor: str = None,
+    user=Depends(get_current_user_optional),
+    db: AsyncSession = Depends(get_read_db)
+):
     """User profile page"""
     if not user:
         return RedirectResponse("/login")
     
-    # Get user's posts
-    user_posts = db.query(Post).filter(Post.author_id == user.id).order_by(Post.created_at.desc()).all()
-    
-    posts_html = ""
-    for post in user_posts:
-        skills_html = ""
-        if post.required_skills:
-            for skill in post.required_skills.split(","):
-                skills_html += f'<span class="skills">{skill.strip()}</span>'
-        
-        posts_html += f"""
-        <div class="post">
-            <h3>{post.title}</h3>
-            <p>{post.description}</p>
-            <div>{skills_html}</div>
-            <div class="post-meta">{post.created_at.strftime('%Y-%m-%d')}</div>
-        </div>
-        """
-    
-    if not posts_html:
-        posts_html = "<p>You haven't posted any ideas yet.</p>"
+    matches_html = ""
+    if not cursor:
+        matches = matching_engine.posts_for_user(user.id, settings.match_limit)
+        matched_posts = await fetch_posts_by_ids(db, [m.id for m in matches])
+        if matched_posts:
+            matches_html = f"""
+            <h2 style="margin: 2rem 0 1rem;">Ideas Matching Your Skills</h2>
+            {render_posts(matched_posts)}
+            """
     
-    skills_display = ""
-    if user.skills:
-        for skill in user.skills.split(","):
-            skills_display += f'<span class="skills">{skill.strip()}</span>'
-    
-    content = f"""
+    header = f"""
     <div class="card">
-        <h2>{user.full_name or user.username}</h2>
-        <p><strong>Username:</strong> {user.username}</p>
-        {f"<p><strong>Phone:</strong> {user.phone}</p>" if user.phone else ""}
-        {f"<p><strong>Bio:</strong> {user.bio}</p>" if user.bio else ""}
-        {f"<p><strong>Skills:</strong> {skills_display}</p>" if user.skills else ""}
+        <h2>{escape(user.full_name or user.username)}</h2>
+        <p><strong>Username:</strong> {escape(user.username)}</p>
+        {f"<p><strong>Phone:</strong> {escape(user.phone)}</p>" if user.phone else ""}
+        {f"<p><strong>Bio:</strong> {escape(user.bio)}</p>" if user.bio else ""}
+        {f"<p><strong>Skills:</strong> {render_skills(user.skills, link=False)}</p>" if user.skills else ""}
         <a href="/new-post" class="btn" style="margin-top: 1rem;">Post New Idea</a>
     </div>
+    {matches_html}
     <h2 style="margin: 2rem 0 1rem;">Your Posts</h2>
-    {posts_html}
     """
     
-    return render_html("Profile", content, user)
+    sessions = read_sessions(request)
+    
+    async def chunks():
+        yield header
+        # Get user's posts
+        async with sessions() as stream_db:
+            user_posts = PostPageStream(stream_db, cursor=cursor, author_id=user.id)
+            async for post in user_posts:
+                yield render_post(post, show_author=False)
+        if not user_posts.count:
+            yield "<p>You haven't posted any ideas yet.</p>"
+        if user_posts.next_cursor:
+            yield f'<a href="/profile?cursor={user_posts.next_cursor}" class="btn">Older Posts</a>'
+    
+    return await html_response("Profile", chunks(), user)
 
 
 @app.get("/new-post", response_class=HTMLResponse)
@@ -359,25 +478,261 @@ async def create_post(
     description: str = Form(...),
     required_skills: str = Form(None),
     user=Depends(get_current_user_optional),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Handle new post creation"""
     if not user:
         return RedirectResponse("/login")
     
-    new_post = Post(
-        title=title,
-        description=description,
-        required_skills=required_skills,
-        author_id=user.id
+    if settings.post_write_mode == "group":
+        try:
+            await post_writer.submit(user.id, title, description, required_skills)
+        except RuntimeError:
+            content = """
+            <div class="card" style="max-width: 500px; margin: 2rem auto;">
+                <h2 style="color: red;">Post Failed</h2>
+                <p>Your post could not be saved. Please try again.</p>
+                <a href="/new-post" class="btn">Try Again</a>
+            </div>
+            """
+            return HTMLResponse(render_html("Post Failed", content, user), status_code=503)
+    else:
+        await create_post_direct(db, user.id, title, description, required_skills)
+    
+    return stick_to_primary(RedirectResponse("/profile", status_code=302))
+
+
+async def fetch_collaborators(db: AsyncSession, post_id: int, k: int):
+    """Top matching users for a post as (match, user row) pairs, best first"""
+    matches = matching_engine.collaborators_for_post(post_id, k)
+    if not matches:
+        return []
+    result = await db.execute(
+        select(User.id, User.username, User.full_name, User.skills).where(User.id.in_([m.id for m in matches]))
     )
+    users = {row.id: row for row in result}
+    return [(m, users[m.id]) for m in matches if m.id in users]
+
+
+@app.get("/posts/{post_id}", response_class=HTMLResponse)
+async def post_detail(post_id: int, user=Depends(get_current_user_optional), db: AsyncSession = Depends(get_read_db)):
+    """Single idea with the people best suited to work on it"""
+    posts = await fetch_posts_by_ids(db, [post_id])
+    if not posts:
+        raise HTTPException(status_code=404, detail="Post not found")
     
-    db.add(new_post)
-    db.commit()
+    collaborators = await fetch_collaborators(db, post_id, settings.match_limit)
+    collaborators_html = "".join([render_collaborator(match, candidate) for match, candidate in collaborators])
+    if not collaborators_html:
+        collaborators_html = "<p>No one with matching skills yet.</p>"
     
-    return RedirectResponse("/profile", status_code=302)
+    content = f"""
+    {render_posts(posts)}
+    <h2 style="margin: 2rem 0 1rem;">People Who Could Work On This</h2>
+    {collaborators_html}
+    """
+    
+    return render_html(posts[0].title, content, user)
+
+
+@app.get("/posts", response_class=HTMLResponse)
+async def posts_by_skill(
+    request: Request,
+    skill: str = None,
+    cursor: str = None,
+    user=Depends(get_current_user_optional)
+):
+    """Posts that need a given skill"""
+    if not skill:
+        return RedirectResponse("/")
+    sessions = read_sessions(request)
+    
+    async def chunks():
+        yield f"""
+        <h2 style="margin: 2rem 0 1rem;">Ideas looking for: <span class="skills">{escape(skill)}</span></h2>
+        """
+        async with sessions() as db:
+            posts = PostPageStream(db, cursor=cursor, skill=skill)
+            async for post in posts:
+                yield render_post(post)
+        if not posts.count:
+            yield "<p>No ideas need this skill yet.</p>"
+        if posts.next_cursor:
+            yield f'<a href="/posts?skill={quote(skill)}&cursor={posts.next_cursor}" class="btn">Older Ideas</a>'
+    
+    return await html_response("Ideas by Skill", chunks(), user)
+
+
+@app.get("/search", response_class=HTMLResponse)
+async def search(
+    q: str = "",
+    page: int = Query(1, ge=1),
+    user=Depends(get_current_user_optional),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Full-text search over ideas"""
+    q = q.strip()
+    page = min(page, settings.search_max_page)
+    results_html = ""
+    if q:
+        results, has_more = await search_posts(db, q, page)
+        results_html = "".join([render_search_result(result) for result in results])
+        if not results_html:
+            results_html = "<p>No ideas match your search.</p>"
+        if page > 1:
+            results_html += f'<a href="/search?q={quote(q)}&page={page - 1}" class="btn" style="margin-right: 0.5rem;">Previous</a>'
+        if has_more:
+            results_html += f'<a href="/search?q={quote(q)}&page={page + 1}" class="btn">Next</a>'
+    
+    content = f"""
+    <div class="card">
+        <h2>Search Ideas</h2>
+        <form method="get" action="/search" style="margin-top: 1rem;">
+            <div class="form-group">
+                <input type="text" name="q" value="{escape(q)}" placeholder="e.g. fintech app, machine learning">
+            </div>
+            <button type="submit">Search</button>
+        </form>
+    </div>
+    {results_html}
+    """
+    
+    return render_html("Search", content, user)
+
+
+@app.get("/api/search")
+async def api_search(q: str = "", page: int = Query(1, ge=1), db: AsyncSession = Depends(get_read_db)):
+    """Full-text search as JSON, ranked by relevance"""
+    q = q.strip()
+    page = min(page, settings.search_max_page)
+    if not q:
+        return JSONResponse({"results": [], "page": page, "has_more": False})
+    results, has_more = await search_posts(db, q, page)
+    return JSONResponse({
+        "results": [
+            {
+                "id": r.id,
+                "title": r.title,
+                "snippet": r.snippet,
+                "required_skills": r.required_skills,
+                "author": r.author_username,
+                "created_at": r.created_at.isoformat(),
+            }
+            for r in results
+        ],
+        "page": page,
+        "has_more": has_more,
+    })
+
+
+@app.get("/api/availability")
+async def api_availability(username: str = "", phone: str = "", db: AsyncSession = Depends(get_read_db)):
+    """Whether a username and/or phone number is still free, for live signup form checks"""
+    phone = phone.strip()
+    taken = await login_filter.taken(db, username, phone)
+    result = {}
+    if username:
+        result["username"] = {"value": username, "available": "username" not in taken}
+    if phone:
+        result["phone"] = {"value": phone, "available": "phone" not in taken}
+    return JSONResponse(result)
+
+
+@app.get("/api/posts/{post_id}/collaborators")
+async def api_post_collaborators(post_id: int, k: int = Query(10, ge=1, le=100), db: AsyncSession = Depends(get_read_db)):
+    """Top-k users whose skills match a post, as JSON"""
+    return JSONResponse({
+        "post_id": post_id,
+        "collaborators": [
+            {"id": m.id, "username": u.username, "score": round(m.score, 4), "shared_skills": m.shared_skills}
+            for m, u in await fetch_collaborators(db, post_id, k)
+        ],
+    })
+
+
+@app.get("/api/users/{username}/matches")
+async def api_user_matches(username: str, k: int = Query(10, ge=1, le=100), db: AsyncSession = Depends(get_read_db)):
+    """Top-k posts matching a user's skills, as JSON"""
+    match_user = await get_user_by_username(db, username)
+    if not match_user:
+        raise HTTPException(status_code=404, detail="User not found")
+    matches = matching_engine.posts_for_user(match_user.id, k)
+    posts = {p.id: p for p in await fetch_posts_by_ids(db, [m.id for m in matches])}
+    return JSONResponse({
+        "username": username,
+        "posts": [
+            {**post_to_dict(posts[m.id]), "score": round(m.score, 4), "shared_skills": m.shared_skills}
+            for m in matches if m.id in posts
+        ],
+    })
+
+
+@app.get("/api/cache-stats")
+async def api_cache_stats():
+    """Feed cache counters for monitoring"""
+    return JSONResponse({
+        "feed": feed_cache.stats(),
+        "users": user_cache.stats(),
+        "post_writer": post_writer.stats(),
+        "password_gate": password_gate.stats(),
+        "invalidation": invalidation_log.stats(),
+        "timeline_fanout": timeline_fanout.stats(),
+        "login_filter": login_filter.stats(),
+    })
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus text exposition of request, SQL, auth, pool, cache and event-loop metrics"""
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404)
+    return Response(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/api/db-stats")
+async def api_db_stats():
+    """Connection pool checkout waits for monitoring"""
+    return JSONResponse(pool_stats.snapshot(engine.sync_engine.pool))
+
+
+def post_to_dict(post: FeedRow) -> dict:
+    return {
+        "id": post.id,
+        "title": post.title,
+        "description": post.description,
+        "required_skills": post.required_skills,
+        "author": post.author_username,
+        "created_at": post.created_at.isoformat(),
+    }
+
+
+@app.get("/api/feed")
+async def api_feed(
+    cursor: str = None,
+    limit: int = Query(None, ge=1, le=100),
+    skill: str = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Home feed as JSON, one keyset page at a time, optionally filtered by skill"""
+    posts, next_cursor = await fetch_posts_page(db, cursor=cursor, limit=limit, skill=skill)
+    return JSONResponse({"posts": [post_to_dict(p) for p in posts], "next_cursor": next_cursor})
+
+
+@app.get("/api/profile/posts")
+async def api_profile_posts(
+    cursor: str = None,
+    limit: int = Query(None, ge=1, le=100),
+    user=Depends(get_current_user_optional),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Current user's posts as JSON, one keyset page at a time"""
+    if not user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    posts, next_cursor = await fetch_posts_page(db, cursor=cursor, author_id=user.id, limit=limit)
+    return JSONResponse({"posts": [post_to_dict(p) for p in posts], "next_cursor": next_cursor})
 
 
 if __name__ == "__main__":
+    # Development server; in production run `python -m app.launcher` (multiple workers)
     import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1,46 @@
+"""Per-client token buckets: burst, refill, rejection with a retry time, eviction."""
+import pytest
+
+from app.admission import RateLimiter
+
+
+def test_burst_then_reject_until_refilled():
+    limiter = RateLimiter(rate=2, burst=3)
+    assert [limiter.take("a", now=0.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+    # Empty bucket: a token is half a second away at 2 per second
+    assert limiter.take("a", now=0.0) == pytest.approx(0.5)
+    assert limiter.take("a", now=0.25) == pytest.approx(0.25)
+    assert limiter.take("a", now=0.5) == 0.0
+    assert limiter.take("a", now=0.5) == pytest.approx(0.5)
+
+
+def test_refill_stops_at_burst():
+    limiter = RateLimiter(rate=1, burst=2)
+    limiter.take("a", now=0.0)
+    limiter.take("a", now=0.0)
+    assert [limiter.take("a", now=100.0) for _ in range(3)] == [0.0, 0.0, pytest.approx(1.0)]
+
+
+def test_clients_have_separate_buckets():
+    limiter = RateLimiter(rate=1, burst=1)
+    assert limiter.take("a", now=0.0) == 0.0
+    assert limiter.take("a", now=0.0) > 0
+    assert limiter.take("b", now=0.0) == 0.0
+
+
+def test_idlest_client_is_evicted():
+    limiter = RateLimiter(rate=1, burst=1, max_keys=2)
+    limiter.take("a", now=0.0)
+    limiter.take("b", now=0.0)
+    limiter.take("a", now=0.0)
+    limiter.take("c", now=0.0)
+    assert len(limiter) == 2
+    assert limiter.evicted == 1
+    # "b" was forgotten, so it starts again from a full bucket
+    assert limiter.take("b", now=0.0) == 0.0
+    assert limiter.take("c", now=0.0) > 0
+
+
+def test_zero_rate_disables_the_limit():
+    limiter = RateLimiter(rate=0, burst=1)
+    assert all(limiter.take("a", now=0.0) == 0.0 for _ in range(10))
@@ -0,0 +1,65 @@
+"""Feed pagination issues one SQL statement per page, whatever the depth."""
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.database.connection import Base
+from app.feed import fetch_posts_page
+from app.models import Post, User
+
+PAGE_SIZE = 5
+
+
+async def seed(engine, posts: int):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine) as db:
+        authors = [User(username=f"user{i}", password_hash="x", is_active=True) for i in range(3)]
+        db.add_all(authors)
+        await db.flush()
+        start = datetime(2024, 1, 1)
+        db.add_all(
+            Post(
+                title=f"Idea {i}",
+                description="Test post",
+                author_id=authors[i % len(authors)].id,
+                # Several posts per second, so pages break inside a second
+                created_at=start + timedelta(seconds=i // 3),
+            )
+            for i in range(posts)
+        )
+        await db.commit()
+
+
+async def walk_pages(posts: int):
+    """Statements issued for each page, and every post id seen, following next cursors"""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    await seed(engine, posts)
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    counts, seen, cursor = [], [], None
+    async with AsyncSession(engine) as db:
+        while True:
+            statements.clear()
+            page, cursor = await fetch_posts_page(db, cursor=cursor, limit=PAGE_SIZE)
+            counts.append(len(statements))
+            seen.extend(post.id for post in page)
+            if cursor is None:
+                break
+    await engine.dispose()
+    return counts, seen
+
+
+def test_one_statement_per_page():
+    counts, _ = asyncio.run(walk_pages(23))
+    assert len(counts) == 5
+    assert counts == [1] * len(counts)
+
+
+def test_cursor_pages_cover_every_post_once():
+    _, seen = asyncio.run(walk_pages(23))
+    assert sorted(seen) == list(range(1, 24))
+    assert len(seen) == len(set(seen))
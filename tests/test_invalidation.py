@@ -0,0 +1,63 @@
+"""Polling the invalidation log: other workers' keys, and a resync after a gap."""
+import asyncio
+import sqlite3
+import time
+
+from app.invalidation import InvalidationLog
+
+OTHER_WORKER = -1
+
+
+def insert(path, *rows):
+    """Rows (channel, key) as another worker would publish them"""
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.executemany(
+        "INSERT INTO invalidations (pid, channel, key, created) VALUES (?, ?, ?, ?)",
+        [(OTHER_WORKER, channel, key, time.time()) for channel, key in rows],
+    )
+    conn.close()
+
+
+def follow(path):
+    """A log reader recording what each channel's handler is called with"""
+    log = InvalidationLog(str(path), interval=60, retention=300)
+    received = {"posts": [], "logins": []}
+    for channel, calls in received.items():
+        log.subscribe(channel, calls.append)
+    log._connect()
+    return log, received
+
+
+def test_poll_applies_keys_from_other_workers(tmp_path):
+    path = tmp_path / "log.db"
+    log, received = follow(path)
+    insert(path, ("posts", "1"), ("posts", "2"), ("logins", "alice"))
+    # Our own rows were applied when published, so polling skips them
+    log.publish("posts", [3])
+
+    asyncio.run(log.poll())
+    assert received == {"posts": [["1", "2"]], "logins": [["alice"]]}
+    assert log.last_id == 4
+    assert log.resyncs == 0
+    asyncio.run(log.stop())
+
+
+def test_gap_resyncs_every_channel(tmp_path):
+    path = tmp_path / "log.db"
+    log, received = follow(path)
+    insert(path, ("posts", "1"), ("posts", "2"), ("posts", "3"))
+    # Pruned before this reader saw them: row 1 is gone, so anything could have changed
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.execute("DELETE FROM invalidations WHERE id = 1")
+    conn.close()
+
+    asyncio.run(log.poll())
+    assert received == {"posts": [None], "logins": [None]}
+    assert log.resyncs == 1
+    assert log.last_id == 3
+
+    insert(path, ("logins", "bob"))
+    asyncio.run(log.poll())
+    assert received["logins"] == [None, ["bob"]]
+    assert log.resyncs == 1
+    asyncio.run(log.stop())
@@ -0,0 +1,52 @@
+"""Fan-out keeps each timeline to its TIMELINE_MAX_ENTRIES newest entries."""
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.config import settings
+from app.database.connection import Base
+from app.models import Post, Skill, User, post_skills, timeline_entries, user_skills
+from app.timeline import fan_out
+
+
+async def fan_out_posts(posts: int):
+    """Fan out ``posts`` posts one at a time to two readers; the post ids left in each timeline"""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(User), [
+            {"id": i, "username": f"user{i}", "password_hash": "x", "is_active": True} for i in (1, 2, 3)
+        ])
+        await conn.execute(insert(Skill), [{"id": 1, "name": "Python"}])
+        await conn.execute(insert(user_skills), [{"user_id": i, "skill_id": 1} for i in (2, 3)])
+        start = datetime(2024, 1, 1)
+        await conn.execute(insert(Post), [
+            {"id": i, "title": f"Idea {i}", "description": "Test post", "author_id": 1,
+             "created_at": start + timedelta(minutes=i)}
+            for i in range(1, posts + 1)
+        ])
+        await conn.execute(insert(post_skills), [{"post_id": i, "skill_id": 1} for i in range(1, posts + 1)])
+    for post_id in range(1, posts + 1):
+        async with engine.begin() as conn:
+            await fan_out(conn, post_ids=[post_id])
+    async with engine.connect() as conn:
+        rows = (await conn.execute(
+            select(timeline_entries.c.user_id, timeline_entries.c.post_id).order_by(timeline_entries.c.post_id)
+        )).all()
+    await engine.dispose()
+    return {user_id: [post_id for reader, post_id in rows if reader == user_id] for user_id in (2, 3)}
+
+
+def test_fan_out_keeps_the_newest_entries(monkeypatch):
+    monkeypatch.setattr(settings, "timeline_max_entries", 5)
+    timelines = asyncio.run(fan_out_posts(12))
+    assert timelines == {2: [8, 9, 10, 11, 12], 3: [8, 9, 10, 11, 12]}
+
+
+def test_zero_keeps_everything(monkeypatch):
+    monkeypatch.setattr(settings, "timeline_max_entries", 0)
+    timelines = asyncio.run(fan_out_posts(12))
+    assert timelines[2] == list(range(1, 13))